@@ -0,0 +1,58 @@
+# entity_state.py
+"""
+Runtime entity record - canonical fields in slots, everything else in extras.
+
+EntityState is also a MutableMapping, so snapshot readers (slice builders,
+serialization, alert handlers) keep using entity["key"] / entity.get("key")
+exactly as they did with the old per-entity dicts.
+"""
+from collections.abc import MutableMapping
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator
+
+CANONICAL_FIELDS = ("id", "type", "position", "velocity", "health", "max_health", "ai_enabled")
+_CANONICAL = frozenset(CANONICAL_FIELDS)
+
+
+@dataclass(slots=True, eq=False)
+class EntityState(MutableMapping):
+    """Slotted entity state; non-canonical keys live in `extras`"""
+    id: str
+    type: str
+    position: Any = (0.0, 0.0, 0.0)
+    velocity: Any = (0.0, 0.0, 0.0)
+    health: Any = 100
+    max_health: Any = 100
+    ai_enabled: bool = False
+    extras: Dict[str, Any] = field(default_factory=dict)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _CANONICAL:
+            return getattr(self, key)
+        return self.extras[key]
+
+    def __setitem__(self, key: str, value: Any):
+        if key in _CANONICAL:
+            setattr(self, key, value)
+        else:
+            self.extras[key] = value
+
+    def __delitem__(self, key: str):
+        if key in _CANONICAL:
+            raise KeyError(f"cannot delete canonical field {key!r}")
+        del self.extras[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from CANONICAL_FIELDS
+        yield from self.extras
+
+    def __len__(self) -> int:
+        return len(CANONICAL_FIELDS) + len(self.extras)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _CANONICAL or key in self.extras
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _CANONICAL:
+            return getattr(self, key)
+        return self.extras.get(key, default)
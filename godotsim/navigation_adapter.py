@@ -22,15 +22,17 @@ class NavigationStateView:
     def __init__(self, initial_state: Dict[str, Any]):
         self._state_slice = {"entities": {}}
         self._spatial_snapshot = {}
+        self._kviews = {}
     
     def set_spatial_state(self, snapshot: Dict[str, Any]):
         self._spatial_snapshot = snapshot
+        self._kviews = {}  # New/updated snapshot - memoized kviews are stale
     
     def request_path(self, entity_id: str, goal: Vec3, current_tick: float) -> Tuple[List[Delta], List[Alert]]:
         deltas = []
         alerts = []
         try:
-            nav_slice = build_nav_slice_v1(self._spatial_snapshot, tick=current_tick, eid=entity_id, goal=goal)
+            nav_slice = build_nav_slice_v1(self._spatial_snapshot, tick=current_tick, eid=entity_id, goal=goal, cache=self._kviews)
             delta = Delta(
                 id=f"nav_{entity_id}_{int(current_tick)}",
                 type="navigation3d/path_requested",
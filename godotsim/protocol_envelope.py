@@ -4,6 +4,12 @@ import json
 from typing import Dict, Any, Optional
 import time
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 class ProtocolError(Exception):
     """Exception for protocol violations"""
     pass
@@ -32,10 +38,16 @@ class ProtocolEnvelope:
         # Create deterministic JSON string for hashing
         # We convert sets to sorted lists and handle non-serializable types
         serializable_state = self._make_serializable(state)
-        payload_str = json.dumps(serializable_state, sort_keys=True, default=str)
+        if HAS_ORJSON:
+            payload_bytes = orjson.dumps(
+                serializable_state, default=str,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            )
+        else:
+            payload_bytes = json.dumps(serializable_state, sort_keys=True, default=str).encode()
         
         # Generate hash for state integrity verification
-        state_hash = hashlib.sha256(payload_str.encode()).hexdigest()
+        state_hash = hashlib.sha256(payload_bytes).hexdigest()
         
         envelope = {
             "protocol": self.PROTOCOL_NAME,
@@ -49,6 +61,17 @@ class ProtocolEnvelope:
         
         return envelope
 
+    def envelope_meta(self, tick: float) -> Dict[str, Any]:
+        """Envelope fields other than payload and hash, for callers that
+        serialize and hash the payload themselves (streamed snapshots)"""
+        return {
+            "protocol": self.PROTOCOL_NAME,
+            "version": self.version,
+            "epoch": self.epoch_id,
+            "tick": tick,
+            "timestamp": time.time() - self.start_time,
+        }
+
     def unwrap_command(self, command_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Parses and validates an incoming command envelope.
@@ -3,13 +3,32 @@
 
 import json
 import sys
+import hashlib
 import time
-import copy
 import threading
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import logging
+import logging.handlers
+import queue
+from collections import defaultdict, deque
+from itertools import islice
+from contextlib import contextmanager
+from collections.abc import Mapping
+from dataclasses import asdict, is_dataclass
+from types import MappingProxyType
+from logging import DEBUG, INFO, WARNING, ERROR
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs
 from typing import Dict, Any, List, Tuple, Optional
+from entity_state import EntityState
 from protocol_envelope import ProtocolEnvelope, ProtocolError, create_envelope_for_runtime
 
+# Optional fast JSON encoder for the HTTP wire path (stdlib json fallback)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Import slice builders - PROTECTION LAYER
 try:
     from slice_builders import build_spatial_slice_v1, build_entity_kview_v1, SliceError
@@ -21,13 +40,18 @@ except ImportError as e:
 
 # Import MR kernels
 try:
-    from spatial3d_mr import step_spatial3d
+    from spatial3d_mr import step_spatial3d, step_spatial3d_arr, HAS_NUMPY, SPATIAL_DTYPE
+    from spatial3d_mr import MAX_SPEED, DEFAULT_RADIUS, broadphase_pairs
     from perception_mr import step_perception
     from behavior3d_mr import update_behavior_mr
     HAS_MR = True
 except ImportError as e:
     print(f"MR kernels missing: {e}")
     HAS_MR = False
+    HAS_NUMPY = False
+
+if HAS_NUMPY:
+    import numpy as np
 
 # Import adapters
 try:
@@ -45,9 +69,38 @@ except ImportError as e:
 print(f"✓ MR kernels | spatial=True, perception=True, behavior=True")
 
 # Kernel contract validation
+# Kernels report changes ONLY through returned deltas/alerts - mutating
+# own_state or foreign inputs is a contract violation (checked in debug mode)
 VALID_KERNEL_RETURN_KEYS = {"deltas", "alerts"}
 VALID_OPS = {"set", "add", "remove", "inc", "dec"}
 
+# Events kept between /snapshot polls; oldest are dropped past this
+EVENTS_MAXLEN = 1024
+
+# /snapshot/stream: entities serialized per chunk of this many
+STREAM_CHUNK_ENTITIES = 100
+
+# Snapshots kept for /snapshot?since=<tick> deltas; older bases get a full resync
+SNAPSHOT_HISTORY = 8
+
+# Sim loop: ticks the loop may fall behind before it skips ahead
+MAX_TICK_LAG = 5
+
+# Subsystem is disabled (attribute set to None) after this many failed ticks in a row
+SUBSYSTEM_MAX_FAILURES = 3
+
+# Spatial3D: an entity that moved less than this (and is this slow) is at rest
+REST_EPSILON = 1e-4
+
+# HTTP: seconds an idle keep-alive connection may hold its handler thread
+KEEPALIVE_TIMEOUT = 30.0
+
+# Runtime log output goes through a queue so formatting I/O stays off the sim thread
+logger = logging.getLogger("engain.runtime")
+
+# Shared read-only stand-in for a missing snapshot slice
+_EMPTY_SLICE = MappingProxyType({})
+
 class KernelContractError(RuntimeError):
     pass
 
@@ -59,25 +112,113 @@ def deep_freeze(obj):
         return [deep_freeze(v) for v in obj]
     return obj
 
+def _copy_state(obj):
+    """Structural copy of nested dicts/lists/deques/sets (leaves shared),
+    so a snapshot can be serialized after the lock is released"""
+    if isinstance(obj, dict):
+        return {k: _copy_state(v) for k, v in obj.items()}
+    if isinstance(obj, (list, deque)):
+        return [_copy_state(v) for v in obj]
+    if isinstance(obj, (set, frozenset)):
+        return set(obj)
+    return obj
+
+def _json_default(obj):
+    """Serialization fallback: deques as lists, EntityState as dict, slice
+    dataclasses via asdict, anything else as str"""
+    if isinstance(obj, deque):
+        return list(obj)
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    return str(obj)
+
+def _dict_to_xyz(v) -> Tuple[float, float, float]:
+    """Godot vector payload -> (x, y, z); accepts [x, y, z] or {"x":, "y":, "z":}"""
+    if isinstance(v, dict):
+        try:
+            return (float(v["x"]), float(v["y"]), float(v["z"]))
+        except KeyError:
+            return (float(v.get("x", 0)), float(v.get("y", 0)), float(v.get("z", 0)))
+    x, y, z = v
+    return (float(x), float(y), float(z))
+
+# update_entity: vector state key -> (entity field, converter); other keys in
+# _UPDATE_SKIP_KEYS are dropped, everything else is copied as-is
+_UPDATE_VECTOR_KEYS = {
+    "position": ("pos", _dict_to_xyz),
+    "velocity": ("vel", _dict_to_xyz),
+}
+_UPDATE_SKIP_KEYS = frozenset(("position", "velocity", "rotation"))
+
+def dumps_bytes(obj) -> bytes:
+    """Serialize to UTF-8 JSON bytes - orjson when available, stdlib json otherwise"""
+    if HAS_ORJSON:
+        return orjson.dumps(
+            obj, default=_json_default,
+            # EntityState is a dataclass too - pass it to _json_default so it
+            # serializes flat, like the dict it stands in for
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATACLASS,
+        )
+    return json.dumps(obj, default=_json_default).encode('utf-8')
+
+def loads_bytes(body: bytes):
+    """Parse a UTF-8 JSON request body - orjson reads the bytes directly"""
+    if HAS_ORJSON:
+        return orjson.loads(body)
+    return json.loads(body.decode('utf-8'))
+
 def stable_hash(obj) -> str:
     """Deterministic hash of state for debugging"""
-    import hashlib
-    payload = json.dumps(obj, sort_keys=True, default=str)
-    return hashlib.sha256(payload.encode()).hexdigest()
+    h = hashlib.sha256()
+    _hash_into(h, obj)
+    return h.hexdigest()
+
+def _hash_into(h, obj):
+    """Feed a canonical encoding of obj straight into h - no intermediate JSON string"""
+    if isinstance(obj, Mapping):
+        h.update(b"{")
+        for k in sorted(obj, key=str):
+            _hash_into(h, str(k))
+            h.update(b":")
+            _hash_into(h, obj[k])
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple, deque)):
+        h.update(b"[")
+        for v in obj:
+            _hash_into(h, v)
+            h.update(b",")
+        h.update(b"]")
+    elif isinstance(obj, str):
+        data = obj.encode()
+        h.update(b"s%d:" % len(data))
+        h.update(data)
+    else:
+        h.update(repr(obj).encode())
 
 class EngAInRuntime:
-    def __init__(self):
+    def __init__(self, log_level: int = INFO, async_post: bool = False):
+        self._init_logging(log_level)
+        
         self.snapshot = {
             "entities": {},
             "spatial": {},
             "perception": {},
             "behavior": {},
             "world": {"time": 0.0, "weather": "clear"},
-            "events": []
+            "events": deque(maxlen=EVENTS_MAXLEN)
         }
         
-        self.delta_queue = []
-        self.command_queue = []
+        # Guards state shared between the HTTP threads and the sim thread:
+        # snapshot, command queue and subsystem state. The sim thread holds
+        # it for each tick's mutation phase; readers copy under it.
+        self._lock = threading.RLock()
+        
+        # FIFOs shared between the HTTP thread (append) and the sim thread (popleft)
+        self.delta_queue = deque()
+        self.command_queue = deque()
         
         self.envelope = create_envelope_for_runtime()
         print(f"  ✓ Protocol: {self.envelope.PROTOCOL_NAME} v{self.envelope.version}")
@@ -88,16 +229,111 @@ class EngAInRuntime:
         self._init_inventory()
         self._init_dialogue()
         
+        # Command dispatch table: action -> handler(cmd)
+        self._action_handlers = {
+            "spawn_entity": self._cmd_spawn_entity,
+            "update_entity": self._cmd_update_entity,
+            "interact": self._handle_interaction,
+            "reload_blocks": self._cmd_reload_blocks,
+            "dump_state": self._cmd_dump_state,
+        }
+        
+        # Alert dispatch table: alert type -> handler(alert)
+        self._alert_handlers = {
+            # Inventory3D
+            "item_taken": self._on_item_taken,
+            "item_dropped": self._on_item_dropped,
+            "item_worn": self._on_item_worn,
+            "item_removed": self._on_item_removed,
+            "take_failed": self._on_take_failed,
+            "overloaded": self._on_overloaded,
+            "fumble_risk": self._on_fumble_risk,
+            # Dialogue3D
+            "dialogue_started": self._on_dialogue_started,
+            "knowledge_shared": self._on_knowledge_shared,
+            "knowledge_unknown": self._on_knowledge_unknown,
+            "branch_selected": self._on_branch_selected,
+            # Combat3D
+            "entity_died": self._on_entity_died,
+            "low_health_warning": self._on_low_health_warning,
+            "wound_state_change": self._on_wound_state_change,
+            "damage_applied": self._on_damage_applied,
+            "attack_hit": self._on_attack_hit,
+            "attack_miss": self._on_attack_miss,
+        }
+        
+        # Per-subsystem bookkeeping for _subsystem(): consecutive failures
+        # and cumulative wall time (seconds)
+        self._subsystem_errors: Dict[str, int] = defaultdict(int)
+        self._subsystem_time: Dict[str, float] = defaultdict(float)
+        
+        # Kernel delta dispatch table: delta type -> handler(payload)
+        self._delta_handlers = {
+            "navigation3d/request_path": self._delta_request_path,
+            "behavior3d/attack": self._delta_attack,
+            "behavior3d/high_intent": self._delta_high_intent,
+        }
+        
+        # Entity ids in spawn order, shared by every subsystem each tick.
+        # Only _put_entity adds to it; a despawn path must rebuild it.
+        self._entity_ids_cache: List[str] = []
+        
+        # Spatial3D SoA store: eid -> row in (N, 3) position/velocity arrays
+        self._eid_index: Dict[str, int] = {}
+        self._eid_rows: List[str] = []
+        self._pos = None
+        self._vel = None
+        # Entities Spatial3D must step (spawned/updated/still moving)
+        self._dirty_spatial: set = set()
+        # Kview memo for the current snapshot contents, replaced whenever
+        # entities may have changed (see build_entity_kview_v1's cache)
+        self._kviews: Dict = {}
+        
+        # (tick, entity copies) of recent dict snapshots, diffed by get_snapshot(since=)
+        self._snapshot_history: deque = deque(maxlen=SNAPSHOT_HISTORY)
+        
+        # Reused every tick by build_snapshot_pack
+        self._snapshot_pack = {"inventory3d": None, "combat3d": None, "dialogue3d": None}
+        
         self.rng = 42  # Deterministic seed for reproducibility
         self.debug = False  # Set True for deep_freeze checks
         
-        self.running = True
+        self._stop = threading.Event()
         self.sim_thread = threading.Thread(target=self._simulation_loop, daemon=True)
         self.sim_thread.start()
         
+        # async_post: POST bodies are parsed/applied by a worker, in arrival
+        # order, and acked before that happens (bad JSON is logged, not 400)
+        self.async_post = async_post
+        self._post_queue = queue.SimpleQueue()
+        self._post_worker = None
+        if async_post:
+            self._post_worker = threading.Thread(target=self._post_loop, daemon=True)
+            self._post_worker.start()
+        
         print("  → son of a bitch.... its finally fixed.. whats next boys?.  ")
         print("EngAIn Runtime: Initialized")
     
+    def _init_logging(self, log_level: int):
+        """Route runtime logs through a QueueHandler; a listener thread does the I/O"""
+        self.log_level = log_level
+        logger.setLevel(log_level)
+        logger.propagate = False
+        
+        if not any(isinstance(h, logging.handlers.QueueHandler) for h in logger.handlers):
+            log_queue = queue.SimpleQueue()
+            stream = logging.StreamHandler(sys.stdout)
+            stream.setFormatter(logging.Formatter("%(message)s"))
+            self._log_listener = logging.handlers.QueueListener(log_queue, stream)
+            self._log_listener.start()
+            logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        else:
+            self._log_listener = None
+    
+    def _log(self, level: int, msg: str, *args):
+        """Log lazily - args are only formatted when the level is enabled"""
+        logger.log(level, msg, *args)
+    
     def _init_subsystems(self):
         if HAS_ADAPTERS:
             try:
@@ -179,111 +415,117 @@ class EngAInRuntime:
             self.dialogue = None
     
     def _create_entity_state(self, entity_id: str, entity_type: str, 
-                            position: Tuple[float, float, float], **kwargs) -> Dict[str, Any]:
-        return {
-            "id": entity_id,
-            "type": entity_type,
-            "position": position,  # Canonical key
-            "velocity": (0.0, 0.0, 0.0),  # Canonical key
-            "health": kwargs.get("health", 100),
-            "max_health": kwargs.get("max_health", 100),
-            "ai_enabled": kwargs.get("ai_enabled", False),
-            **kwargs
-        }
+                            position: Tuple[float, float, float], **kwargs) -> EntityState:
+        entity = EntityState(entity_id, entity_type, position)
+        entity.update(kwargs)  # Canonical keys land in slots, the rest in extras
+        return entity
+    
+    def _put_entity(self, entity_id: str, entity_state: EntityState):
+        """Insert/replace an entity and mark it for the next spatial step"""
+        if type(entity_id) is str:
+            # Interned ids hash/compare by pointer in every later lookup
+            entity_id = sys.intern(entity_id)
+        entities = self.snapshot["entities"]
+        if entity_id not in entities:
+            self._entity_ids_cache.append(entity_id)
+        entities[entity_id] = entity_state
+        self._dirty_spatial.add(entity_id)
     
     def _simulation_loop(self):
         dt = 0.016
-        while self.running:
-            start_time = time.time()
-            self._process_commands()
-            self._update_subsystems(dt)
-            self.snapshot["world"]["time"] += dt
-            elapsed = time.time() - start_time
-            sleep_time = max(0, dt - elapsed)
-            time.sleep(sleep_time)
+        max_lag = MAX_TICK_LAG * dt
+        t0 = time.perf_counter()
+        n = 0
+        while not self._stop.is_set():
+            n += 1
+            target = t0 + n * dt
+            with self._lock:
+                self._process_commands()
+                self._update_subsystems(dt)
+                self.snapshot["world"]["time"] += dt
+            
+            # Fixed cadence: sleep until the next deadline, not dt from "now"
+            slack = target - time.perf_counter()
+            if slack > 0:
+                self._stop.wait(slack)
+            elif -slack > max_lag:
+                # Too far behind - skip ahead instead of spiralling
+                n += int(-slack / dt)
     
     def _process_commands(self):
         while self.command_queue:
-            cmd = self.command_queue.pop(0)
-            self._execute_command(cmd)
+            self._execute_command(self.command_queue.popleft())
     
     def _execute_command(self, cmd: Dict[str, Any]):
-        action = cmd.get("action")
+        handler = self._action_handlers.get(cmd.get("action"))
+        if handler:
+            handler(cmd)
+    
+    def _cmd_spawn_entity(self, cmd: Dict[str, Any]):
+        entity_id = cmd.get("entity_id")
+        entity_type = cmd.get("entity_type")
+        position = cmd.get("position", {"x": 0, "y": 0, "z": 0})
+        properties = cmd.get("properties", {})
         
-        if action == "spawn_entity":
-            entity_id = cmd.get("entity_id")
-            entity_type = cmd.get("entity_type")
-            position = cmd.get("position", {"x": 0, "y": 0, "z": 0})
-            properties = cmd.get("properties", {})
-            
-            pos_tuple = (position.get("x", 0), position.get("y", 0), position.get("z", 0))
-            
-            entity_state = self._create_entity_state(
-                entity_id, entity_type, pos_tuple,
-                ai_enabled=properties.get("ai_enabled", False),
-                **properties
-            )
-            
-            self.snapshot["entities"][entity_id] = entity_state
-            
-            if self.spatial:
-                try:
-                    self.spatial.spawn_entity(entity_id, pos_tuple)
-                    print(f"✓ Spawned {entity_type} '{entity_id}' (Spatial3D)")
-                except:
-                    print(f"✓ Spawned {entity_type} '{entity_id}'")
-            else:
-                print(f"✓ Spawned {entity_type} '{entity_id}'")
-
-        elif action == "update_entity":
-            entity = cmd.get("entity")
-            state = cmd.get("state", {})
-            
-            if entity and entity in self.snapshot["entities"]:
-                # Normalize Godot types to Python tuples
-                if "position" in state:
-                    p = state["position"]
-                    if isinstance(p, dict):
-                        self.snapshot["entities"][entity]["pos"] = (
-                            float(p.get("x", 0)), 
-                            float(p.get("y", 0)), 
-                            float(p.get("z", 0))
-                        )
-                
-                if "velocity" in state:
-                    v = state["velocity"]
-                    if isinstance(v, dict):
-                        self.snapshot["entities"][entity]["vel"] = (
-                            float(v.get("x", 0)), 
-                            float(v.get("y", 0)), 
-                            float(v.get("z", 0))
-                        )
-                
-                # Update other fields
-                for k, v in state.items():
-                    if k not in ["position", "velocity", "rotation"]:
-                        self.snapshot["entities"][entity][k] = v
-            elif entity and entity not in self.snapshot["entities"]:
-                # Auto-create if missing (lazy spawn for player)
-                print(f"Lazy spawning {entity} from update")
-                p = state.get("position", {"x":0,"y":0,"z":0})
-                pos_tuple = (p.get("x", 0), p.get("y", 0), p.get("z", 0))
-                
-                # Filter out position from state to prevent dual-argument error
-                create_kwargs = {k:v for k,v in state.items() if k != "position"}
-                
-                self.snapshot["entities"][entity] = self._create_entity_state(
-                    entity, "player", pos_tuple, **create_kwargs
-                )
+        pos_tuple = (position.get("x", 0), position.get("y", 0), position.get("z", 0))
         
-        elif action == "interact":
-            self._handle_interaction(cmd)
+        entity_state = self._create_entity_state(
+            entity_id, entity_type, pos_tuple,
+            ai_enabled=properties.get("ai_enabled", False),
+            **properties
+        )
+        
+        self._put_entity(entity_id, entity_state)
         
-        elif action == "reload_blocks":
-            print("Reloading blocks...")
+        if self.spatial:
+            try:
+                self.spatial.spawn_entity(entity_id, pos_tuple)
+                self._log(DEBUG, "✓ Spawned %s '%s' (Spatial3D)", entity_type, entity_id)
+            except:
+                self._log(DEBUG, "✓ Spawned %s '%s'", entity_type, entity_id)
+        else:
+            self._log(DEBUG, "✓ Spawned %s '%s'", entity_type, entity_id)
+    
+    def _cmd_update_entity(self, cmd: Dict[str, Any]):
+        entity = cmd.get("entity")
+        state = cmd.get("state", {})
+        if type(entity) is str:
+            entity = sys.intern(entity)
         
-        elif action == "dump_state":
-            self._dump_full_state()
+        entities = self.snapshot["entities"]
+        if entity and entity in entities:
+            e = entities[entity]
+            moved = False
+            for k, v in state.items():
+                if k in _UPDATE_SKIP_KEYS:
+                    # Normalize Godot vectors to Python tuples
+                    conv = _UPDATE_VECTOR_KEYS.get(k)
+                    if conv is not None:
+                        e[conv[0]] = conv[1](v)
+                        moved = True
+                else:
+                    e[k] = v
+            
+            if moved:
+                self._dirty_spatial.add(entity)
+        elif entity:
+            # Auto-create if missing (lazy spawn for player)
+            self._log(DEBUG, "Lazy spawning %s from update", entity)
+            p = state.get("position")
+            pos_tuple = _dict_to_xyz(p) if p is not None else (0.0, 0.0, 0.0)
+            
+            # Filter out position from state to prevent dual-argument error
+            create_kwargs = {k:v for k,v in state.items() if k != "position"}
+            
+            self._put_entity(entity, self._create_entity_state(
+                entity, "player", pos_tuple, **create_kwargs
+            ))
+    
+    def _cmd_reload_blocks(self, cmd: Dict[str, Any]):
+        self._log(DEBUG, "Reloading blocks...")
+    
+    def _cmd_dump_state(self, cmd: Dict[str, Any]):
+        self._dump_full_state()
     
     def _handle_interaction(self, cmd: Dict[str, Any]):
         entity = cmd.get("entity", "unknown")
@@ -291,7 +533,7 @@ class EngAInRuntime:
         player_gold = cmd.get("player_gold", 0)
         context = cmd.get("context", "default")
         
-        print(f"\n[INTERACTION] {entity} (context: {context})")
+        self._log(DEBUG, "\n[INTERACTION] %s (context: %s)", entity, context)
         
         if entity == "greeter":
             greeter_id = "greeter_main"
@@ -314,7 +556,7 @@ class EngAInRuntime:
                 reputation=player_rep, ai_enabled=True
             )
             
-            self.snapshot["entities"][greeter_id] = entity_state
+            self._put_entity(greeter_id, entity_state)
             
             if self.spatial:
                 try:
@@ -330,7 +572,7 @@ class EngAInRuntime:
                         initial_state="idle",
                         patrol_points=[(5,0,3), (10,0,5), (5,0,3)]
                     )
-                    print(f"  [BEHAVIOR] AI enabled for {greeter_id}")
+                    self._log(DEBUG, "  [BEHAVIOR] AI enabled for %s", greeter_id)
                     
                     # Seed perception so greeter can react
                     if greeter_id not in self.snapshot["perception"]:
@@ -342,14 +584,14 @@ class EngAInRuntime:
                             "visible_entities": ["player"],
                             "focus_target": "player"
                         }
-                        print(f"  [PERCEPTION] Greeter hostile - focused on player")
+                        self._log(DEBUG, "  [PERCEPTION] Greeter hostile - focused on player")
                     else:
                         # Friendly - aware but not focused
                         self.snapshot["perception"][greeter_id] = {
                             "visible_entities": ["player"],
                             "focus_target": None
                         }
-                        print(f"  [PERCEPTION] Greeter friendly - player visible")
+                        self._log(DEBUG, "  [PERCEPTION] Greeter friendly - player visible")
                     
                 except:
                     pass
@@ -361,7 +603,7 @@ class EngAInRuntime:
                 "mood": mood
             })
             
-            print(f"  Greeter spawned: '{dialogue}' (mood: {mood})")
+            self._log(DEBUG, "  Greeter spawned: '%s' (mood: %s)", dialogue, mood)
         
         elif entity == "merchant":
             merchant_id = "merchant_main"
@@ -382,7 +624,7 @@ class EngAInRuntime:
                 inventory=["sword", "potion", "shield"]
             )
             
-            self.snapshot["entities"][merchant_id] = entity_state
+            self._put_entity(merchant_id, entity_state)
             
             if self.spatial:
                 try:
@@ -397,13 +639,36 @@ class EngAInRuntime:
                 "gold": player_gold
             })
             
-            print(f"  Merchant spawned: '{dialogue}'")
-            print(f"  Inventory: {entity_state['inventory']}")
+            self._log(DEBUG, "  Merchant spawned: '%s'", dialogue)
+            self._log(DEBUG, "  Inventory: %s", entity_state['inventory'])
+    
+    @contextmanager
+    def _subsystem(self, name: str):
+        """Time one subsystem step and contain its failure.
+
+        `name` is the runtime attribute holding the subsystem; after
+        SUBSYSTEM_MAX_FAILURES consecutive failures it is set to None.
+        """
+        t = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            errors = self._subsystem_errors
+            errors[name] += 1
+            self._log(ERROR, "[%s ERROR] %s", name.upper(), e)
+            if errors[name] >= SUBSYSTEM_MAX_FAILURES:
+                self._log(ERROR, "[%s] disabled after %d consecutive failures", name.upper(), errors[name])
+                setattr(self, name, None)
+        else:
+            self._subsystem_errors[name] = 0
+        finally:
+            self._subsystem_time[name] += time.perf_counter() - t
     
     def _update_subsystems(self, dt: float):
         """Sealed snapshot → run all kernels → apply once"""
         tick = self.snapshot["world"]["time"]
-        pre_hash = stable_hash(self.snapshot)
+        # State hashing is debug telemetry - never pay for it in the hot path
+        pre_hash = stable_hash(self.snapshot) if self.debug else None
         snapshot_pack = self.build_snapshot_pack()
         
         all_deltas = []
@@ -414,70 +679,50 @@ class EngAInRuntime:
         
         # Combat3D
         if self.combat:
-            try:
+            with self._subsystem("combat"):
                 for delta_type, payload in self.combat.tick(dt):
                     all_deltas.append((delta_type, payload))
-            except Exception as e:
-                print(f"[COMBAT ERROR] {e}")
         
         # Inventory3D
         if self.inventory:
-            try:
+            with self._subsystem("inventory"):
                 inv_deltas, inv_alerts = self.inventory.tick(dt)
                 all_alerts.extend(inv_alerts)
-            except Exception as e:
-                print(f"[INVENTORY ERROR] {e}")
         
         # Dialogue3D
         if self.dialogue:
-            try:
+            with self._subsystem("dialogue"):
                 dlg_deltas, dlg_alerts = self.dialogue.tick(dt)
                 all_alerts.extend(dlg_alerts)
-            except Exception as e:
-                print(f"[DIALOGUE ERROR] {e}")
         
         # Spatial3D (entity-based, runs with slice protection)
-        entity_ids = list(self.snapshot["entities"].keys())
+        entity_ids = self._entity_ids_cache
         if entity_ids and HAS_MR and self.spatial and HAS_SLICES:
-            try:
-                spatial_state = {"entities": {}}
-                for eid in entity_ids:
-                    try:
-                        slice_view = build_entity_kview_v1(self.snapshot, eid)
-                        spatial_state["entities"][eid] = {
-                            "pos": slice_view.pos,
-                            "vel": slice_view.vel
-                        }
-                    except SliceError as e:
-                        print(f"[SLICE ERROR] {eid}: {e}")
-                        continue
-                
-                snapshot_in = {"spatial3d": spatial_state}
-                snapshot_out, accepted, alerts = step_spatial3d(snapshot_in, [], dt)
-                
-                updated_spatial = snapshot_out.get("spatial3d", {})
-                for eid, spatial_data in updated_spatial.get("entities", {}).items():
-                    if eid in self.snapshot["entities"]:
-                        self.snapshot["entities"][eid]["position"] = list(spatial_data["pos"])
-                        self.snapshot["entities"][eid]["velocity"] = list(spatial_data["vel"])
-            except Exception as e:
-                print(f"[SPATIAL ERROR] {e}")
+            # Drop views from before this tick's commands, and again once
+            # Spatial3D has moved entities
+            self._kviews = {}
+            with self._subsystem("spatial"):
+                if HAS_NUMPY:
+                    self._step_spatial_soa(dt)
+                else:
+                    self._step_spatial_dict(entity_ids, dt)
+            self._kviews = {}
+        
+        apply_delta = self._apply_delta
         
         # Perception (entity-based)
         if self.perception and entity_ids:
-            try:
+            with self._subsystem("perception"):
                 self.perception.set_spatial_state(self.snapshot)
                 perception_deltas, perception_alerts = self.perception.perception_step(
                     current_tick=int(tick)
                 )
                 for delta in perception_deltas:
-                    self._apply_delta(delta)
-            except Exception as e:
-                print(f"[PERCEPTION ERROR] {e}")
+                    apply_delta(delta)
         
         # Behavior (entity-based)
         if self.behavior and entity_ids:
-            try:
+            with self._subsystem("behavior"):
                 self.behavior.set_spatial_state(self.snapshot)
                 self.behavior.set_perception_state(self.snapshot.get("perception", {}))
                 behavior_deltas, behavior_alerts = self.behavior.behavior_step(
@@ -485,19 +730,120 @@ class EngAInRuntime:
                     delta_time=dt
                 )
                 if behavior_deltas:
-                    print(f"[BEHAVIOR] {len(behavior_deltas)} deltas fired")
+                    self._log(DEBUG, "[BEHAVIOR] %s deltas fired", len(behavior_deltas))
                 for delta in behavior_deltas:
-                    self._apply_delta(delta)
-            except Exception as e:
-                print(f"[BEHAVIOR ERROR] {e}")
+                    apply_delta(delta)
         
         # Apply all collected deltas and alerts
         self._apply_deltas(all_deltas)
         self._push_alerts(all_alerts)
         
-        post_hash = stable_hash(self.snapshot)
         if self.debug:
-            print(f"[TICK {tick}] state hash: {pre_hash[:12]} → {post_hash[:12]}")
+            post_hash = stable_hash(self.snapshot)
+            self._log(DEBUG, "[TICK %s] state hash: %s → %s", tick, pre_hash[:12], post_hash[:12])
+
+    def _step_spatial_dict(self, entity_ids: List[str], dt: float):
+        """Spatial3D step over per-entity dicts (fallback when NumPy is missing)"""
+        views = (self._kview_or_none(eid) for eid in entity_ids)
+        spatial_state = {"entities": {v.eid: {"pos": v.pos, "vel": v.vel} for v in views if v is not None}}
+        
+        snapshot_in = {"spatial3d": spatial_state}
+        snapshot_out, accepted, alerts = step_spatial3d(snapshot_in, [], dt)
+        
+        entities = self.snapshot["entities"]
+        for eid, spatial_data in snapshot_out["spatial3d"]["entities"].items():
+            entity = entities.get(eid)
+            if entity is not None:
+                entity["position"] = spatial_data["pos"]
+                entity["velocity"] = spatial_data["vel"]
+    
+    def _kview_or_none(self, eid: str):
+        """Entity kernel view, or None (logged) if the entity breaks the slice contract"""
+        try:
+            return build_entity_kview_v1(self.snapshot, eid, cache=self._kviews)
+        except SliceError as e:
+            self._log(WARNING, "[SLICE ERROR] %s: %s", eid, e)
+            return None
+
+    def _step_spatial_soa(self, dt: float):
+        """
+        Spatial3D step over (N, 3) position/velocity arrays.
+        Only dirty entities (plus resting ones they could reach this tick)
+        are stepped; entities that come to rest leave the dirty set.
+        """
+        entities = self.snapshot["entities"]
+        dirty = self._dirty_spatial
+        for eid in [eid for eid in dirty if eid not in entities]:
+            dirty.discard(eid)
+        # Sorted: SoA rows and kernel order must not depend on set hashing
+        views = [v for v in map(self._kview_or_none, sorted(dirty)) if v is not None]
+        if not views:
+            return
+        
+        ids = [v.eid for v in views]
+        rows = self._spatial_rows(ids)
+        self._pos[rows] = [v.pos for v in views]
+        self._vel[rows] = [v.vel for v in views]
+        
+        # Wake resting entities within collision reach of a moving one
+        woken = self._spatial_neighbours(rows, dt)
+        if woken:
+            ids += [self._eid_rows[r] for r in woken]
+            rows += woken
+            dirty.update(self._eid_rows[r] for r in woken)
+        
+        pos_in = self._pos[rows]
+        pos_out, vel_out, alerts = step_spatial3d_arr(ids, pos_in, self._vel[rows], dt)
+        self._pos[rows] = pos_out
+        self._vel[rows] = vel_out
+        
+        moved = pos_out - pos_in
+        at_rest = (
+            (np.einsum("ij,ij->i", moved, moved) < REST_EPSILON * REST_EPSILON)
+            & (np.einsum("ij,ij->i", vel_out, vel_out) < REST_EPSILON * REST_EPSILON)
+        )
+        
+        for eid, pos, vel, rest in zip(ids, pos_out.tolist(), vel_out.tolist(), at_rest.tolist()):
+            entity = entities.get(eid)
+            if entity is not None:
+                entity["position"] = pos
+                entity["velocity"] = vel
+            if rest:
+                dirty.discard(eid)
+    
+    def _spatial_neighbours(self, rows: List[int], dt: float) -> List[int]:
+        """Rows of resting entities a moving entity could collide with this tick"""
+        moving = np.zeros(len(self._eid_rows), dtype=bool)
+        moving[rows] = True
+        resting = np.flatnonzero(~moving)
+        if resting.size == 0:
+            return []
+        
+        reach = 2 * DEFAULT_RADIUS + MAX_SPEED * dt
+        near = np.zeros(resting.size, dtype=bool)
+        for i, _ in broadphase_pairs(self._pos[resting], reach, self._pos[rows]):
+            near[i] = True
+        return resting[near].tolist()
+    
+    def _spatial_rows(self, eids: List[str]) -> List[int]:
+        """Map entity ids to SoA rows, growing the arrays on first sight"""
+        index = self._eid_index
+        for eid in eids:
+            if eid not in index:
+                index[eid] = len(index)
+                self._eid_rows.append(eid)
+        
+        needed = len(index)
+        if self._pos is None:
+            capacity = max(16, 2 * needed)
+            self._pos = np.zeros((capacity, 3), dtype=SPATIAL_DTYPE)
+            self._vel = np.zeros((capacity, 3), dtype=SPATIAL_DTYPE)
+        elif needed > len(self._pos):
+            capacity = 2 * needed
+            self._pos = np.resize(self._pos, (capacity, 3))
+            self._vel = np.resize(self._vel, (capacity, 3))
+        
+        return [index[eid] for eid in eids]
 
     def _apply_deltas(self, deltas: list):
         """Apply collected deltas to committed state"""
@@ -509,204 +855,165 @@ class EngAInRuntime:
             value = delta.get("value")
             
             # For now, just log - actual application depends on op type
-            print(f"  [DELTA] {domain}/{op}: {path}")
+            self._log(DEBUG, "  [DELTA] %s/%s: %s", domain, op, path)
 
     def _push_alerts(self, alerts: list):
         """Push collected alerts to handlers"""
+        handlers = self._alert_handlers
         for alert in alerts:
-            alert_type = alert.get("type", "")
-            
-            # Route to appropriate handler based on source domain
-            if "inventory" in alert_type or alert_type in ["item_taken", "item_dropped", "item_worn"]:
-                self._apply_inventory_alert(alert)
-            elif "combat" in alert_type or alert_type in ["entity_died", "attack_hit", "attack_miss"]:
-                self._apply_combat_alert(alert)
-            elif "dialogue" in alert_type or alert_type in ["dialogue_started", "knowledge_shared"]:
-                self._apply_dialogue_alert(alert)
-            else:
-                print(f"  [ALERT] {alert_type}: {alert}")
-
-    def _apply_inventory_alert(self, alert: Dict[str, Any]):
-        """Process inventory alerts"""
-        alert_type = alert.get("type")
-        
-        if alert_type == "item_taken":
-            actor = alert.get("actor")
-            item = alert.get("item")
-            print(f"  📦 {actor} picked up {item}")
-        
-        elif alert_type == "item_dropped":
-            actor = alert.get("actor")
-            item = alert.get("item")
-            location = alert.get("location")
-            print(f"  📦 {actor} dropped {item} at {location}")
-        
-        elif alert_type == "item_worn":
-            actor = alert.get("actor")
-            item = alert.get("item")
-            print(f"  👕 {actor} equipped {item}")
-        
-        elif alert_type == "item_removed":
-            actor = alert.get("actor")
-            item = alert.get("item")
-            print(f"  👕 {actor} unequipped {item}")
-        
-        elif alert_type == "take_failed":
-            reason = alert.get("reason")
-            actor = alert.get("actor")
-            item = alert.get("item")
-            
-            if reason == "too_heavy":
-                current = alert.get("current_weight")
-                item_weight = alert.get("item_weight")
-                limit = alert.get("limit")
-                print(f"  ⚠️  {actor} can't carry {item}: too heavy ({current}+{item_weight} > {limit})")
-            elif reason == "too_many_items":
-                count = alert.get("carry_count")
-                limit = alert.get("limit")
-                print(f"  ⚠️  {actor} fumbling: too many items ({count}/{limit})")
-            else:
-                print(f"  ⚠️  {actor} can't take {item}: {reason}")
+            handlers.get(alert.get("type"), self._on_unknown_alert)(alert)
+
+    def _on_unknown_alert(self, alert: Dict[str, Any]):
+        self._log(DEBUG, "  [ALERT] %s: %s", alert.get('type', ''), alert)
+
+    # --- Inventory alerts ---
+
+    def _on_item_taken(self, alert: Dict[str, Any]):
+        self._log(DEBUG, "  📦 %s picked up %s", alert.get('actor'), alert.get('item'))
+
+    def _on_item_dropped(self, alert: Dict[str, Any]):
+        self._log(DEBUG, "  📦 %s dropped %s at %s", alert.get('actor'), alert.get('item'), alert.get('location'))
+
+    def _on_item_worn(self, alert: Dict[str, Any]):
+        self._log(DEBUG, "  👕 %s equipped %s", alert.get('actor'), alert.get('item'))
+
+    def _on_item_removed(self, alert: Dict[str, Any]):
+        self._log(DEBUG, "  👕 %s unequipped %s", alert.get('actor'), alert.get('item'))
+
+    def _on_take_failed(self, alert: Dict[str, Any]):
+        reason = alert.get("reason")
+        actor = alert.get("actor")
+        item = alert.get("item")
         
-        elif alert_type == "overloaded":
-            entity = alert.get("entity")
-            weight = alert.get("current_weight")
+        if reason == "too_heavy":
+            current = alert.get("current_weight")
+            item_weight = alert.get("item_weight")
             limit = alert.get("limit")
-            print(f"  ⚠️  {entity} overloaded: {weight}/{limit}")
-        
-        elif alert_type == "fumble_risk":
-            entity = alert.get("entity")
+            self._log(DEBUG, "  ⚠️  %s can't carry %s: too heavy (%s+%s > %s)", actor, item, current, item_weight, limit)
+        elif reason == "too_many_items":
             count = alert.get("carry_count")
             limit = alert.get("limit")
-            print(f"  ⚠️  {entity} fumble risk: {count}/{limit} items")
-
-    def _apply_dialogue_alert(self, alert: Dict[str, Any]):
-        """Process dialogue alerts"""
-        alert_type = alert.get("type")
-        
-        if alert_type == "dialogue_started":
-            speaker = alert.get("speaker")
-            listener = alert.get("listener")
-            print(f"  💬 {speaker} speaks to {listener}")
-        
-        elif alert_type == "knowledge_shared":
-            asker = alert.get("asker")
-            topic = alert.get("topic")
-            print(f"  📚 {asker} learned: {topic}")
-        
-        elif alert_type == "knowledge_unknown":
-            topic = alert.get("topic")
-            print(f"  ❓ Topic unknown: {topic}")
-        
-        elif alert_type == "branch_selected":
-            speaker = alert.get("speaker")
-            branch_id = alert.get("branch_id")
-            print(f"  🔀 {speaker} chose: {branch_id}")
-
-    def _apply_combat_alert(self, alert: Dict[str, Any]):
-        """Process combat alerts"""
-        alert_type = alert.get("type")
-        
-        if alert_type == "entity_died":
-            entity_id = alert.get("entity_id")
-            print(f"  💀 {entity_id} has died")
-            
-            # Update main snapshot
-            if entity_id in self.snapshot["entities"]:
-                self.snapshot["entities"][entity_id]["alive"] = False
-                self.snapshot["entities"][entity_id]["state"] = "dead"
-            
-            # Disable navigation
-            if self.behavior:
-                self.behavior.set_behavior_state(entity_id, "dead")
-        
-        elif alert_type == "low_health_warning":
-            entity_id = alert.get("entity_id")
-            health = alert.get("health")
-            print(f"  ⚠️  {entity_id} low health: {health}")
-            
-            # Set low_health flag for behavior
-            if self.behavior:
-                # Trigger flee behavior
-                pass
-        
-        elif alert_type == "wound_state_change":
-            entity_id = alert.get("entity_id")
-            old_state = alert.get("old_state")
-            new_state = alert.get("new_state")
-            print(f"  🩹 {entity_id}: {old_state} → {new_state}")
-        
-        elif alert_type == "damage_applied":
-            target = alert.get("target")
-            amount = alert.get("amount")
-            source = alert.get("source")
-            print(f"  ⚔️  {source} hits {target} for {amount} damage")
-
-        elif alert_type == "attack_hit":
-            attacker = alert.get("attacker")
-            target = alert.get("target")
-            damage = alert.get("damage")
-            print(f"  ⚔️  {attacker} hits {target} for {damage} damage")
-        
-        elif alert_type == "attack_miss":
-            attacker = alert.get("attacker")
-            target = alert.get("target")
-            print(f"  ⭕ {attacker} misses {target}")
+            self._log(DEBUG, "  ⚠️  %s fumbling: too many items (%s/%s)", actor, count, limit)
+        else:
+            self._log(DEBUG, "  ⚠️  %s can't take %s: %s", actor, item, reason)
 
-    def _apply_delta(self, delta):
-        delta_type = delta.type
-        payload = delta.payload
+    def _on_overloaded(self, alert: Dict[str, Any]):
+        self._log(DEBUG, "  ⚠️  %s overloaded: %s/%s", alert.get('entity'), alert.get('current_weight'), alert.get('limit'))
+
+    def _on_fumble_risk(self, alert: Dict[str, Any]):
+        self._log(DEBUG, "  ⚠️  %s fumble risk: %s/%s items", alert.get('entity'), alert.get('carry_count'), alert.get('limit'))
+
+    # --- Dialogue alerts ---
+
+    def _on_dialogue_started(self, alert: Dict[str, Any]):
+        self._log(DEBUG, "  💬 %s speaks to %s", alert.get('speaker'), alert.get('listener'))
+
+    def _on_knowledge_shared(self, alert: Dict[str, Any]):
+        self._log(DEBUG, "  📚 %s learned: %s", alert.get('asker'), alert.get('topic'))
+
+    def _on_knowledge_unknown(self, alert: Dict[str, Any]):
+        self._log(DEBUG, "  ❓ Topic unknown: %s", alert.get('topic'))
+
+    def _on_branch_selected(self, alert: Dict[str, Any]):
+        self._log(DEBUG, "  🔀 %s chose: %s", alert.get('speaker'), alert.get('branch_id'))
+
+    # --- Combat alerts ---
+
+    def _on_entity_died(self, alert: Dict[str, Any]):
+        entity_id = alert.get("entity_id")
+        self._log(DEBUG, "  💀 %s has died", entity_id)
         
-        print(f"  🔥 [{delta_type}]")
+        # Update main snapshot
+        if entity_id in self.snapshot["entities"]:
+            self.snapshot["entities"][entity_id]["alive"] = False
+            self.snapshot["entities"][entity_id]["state"] = "dead"
         
-        if delta_type == "navigation3d/request_path":
-            entity_id = payload.get("entity_id")
-            if entity_id:
-                print(f"     Path request for {entity_id}")
+        # Disable navigation
+        if self.behavior:
+            self.behavior.set_behavior_state(entity_id, "dead")
+
+    def _on_low_health_warning(self, alert: Dict[str, Any]):
+        self._log(DEBUG, "  ⚠️  %s low health: %s", alert.get('entity_id'), alert.get('health'))
         
-        elif delta_type == "behavior3d/attack":
-            attacker = payload.get("attacker")
-            target = payload.get("target")
-            print(f"     {attacker} → attacks → {target}")
-            
-            self.snapshot["events"].append({
-                "type": "attack_initiated",
-                "attacker": attacker,
-                "target": target
-            })
+        # Set low_health flag for behavior
+        if self.behavior:
+            # Trigger flee behavior
+            pass
+
+    def _on_wound_state_change(self, alert: Dict[str, Any]):
+        self._log(DEBUG, "  🩹 %s: %s → %s", alert.get('entity_id'), alert.get('old_state'), alert.get('new_state'))
+
+    def _on_damage_applied(self, alert: Dict[str, Any]):
+        self._log(DEBUG, "  ⚔️  %s hits %s for %s damage", alert.get('source'), alert.get('target'), alert.get('amount'))
+
+    def _on_attack_hit(self, alert: Dict[str, Any]):
+        self._log(DEBUG, "  ⚔️  %s hits %s for %s damage", alert.get('attacker'), alert.get('target'), alert.get('damage'))
+
+    def _on_attack_miss(self, alert: Dict[str, Any]):
+        self._log(DEBUG, "  ⭕ %s misses %s", alert.get('attacker'), alert.get('target'))
+
+    def _apply_delta(self, delta):
+        delta_type = delta.type
+        self._log(DEBUG, "  🔥 [%s]", delta_type)
+        self._delta_handlers.get(delta_type, self._on_unknown_delta)(delta.payload)
+
+    def _on_unknown_delta(self, payload: Dict[str, Any]):
+        self._log(DEBUG, "     (unhandled) %s", payload)
+
+    def _delta_request_path(self, payload: Dict[str, Any]):
+        entity_id = payload.get("entity_id")
+        if entity_id:
+            self._log(DEBUG, "     Path request for %s", entity_id)
+
+    def _delta_attack(self, payload: Dict[str, Any]):
+        get = payload.get
+        attacker = get("attacker")
+        target = get("target")
+        self._log(DEBUG, "     %s → attacks → %s", attacker, target)
         
-        elif delta_type == "behavior3d/high_intent":
-            entity_id = payload.get("entity_id")
-            intent = payload.get("intent", 0.0)
-            print(f"     {entity_id} HIGH INTENT: {intent:.2f}")
+        self.snapshot["events"].append({
+            "type": "attack_initiated",
+            "attacker": attacker,
+            "target": target
+        })
+
+    def _delta_high_intent(self, payload: Dict[str, Any]):
+        entity_id = payload.get("entity_id")
+        intent = payload.get("intent", 0.0)
+        self._log(DEBUG, "     %s HIGH INTENT: %.2f", entity_id, intent)
     
     def _dump_full_state(self):
-        print("\n=== STATE DUMP ===")
-        print(json.dumps(self.snapshot, indent=2, default=str))
+        self._log(INFO, "\n=== STATE DUMP ===")
+        self._log(INFO, "%s", json.dumps(self.snapshot, indent=2, default=_json_default))
         
         if self.behavior:
-            print("\n=== BEHAVIOR STATES ===")
+            self._log(INFO, "\n=== BEHAVIOR STATES ===")
             for entity_id in self.snapshot["entities"].keys():
                 behavior_state = self.behavior.get_behavior_state(entity_id)
                 if behavior_state:
-                    print(f"{entity_id}:")
-                    print(f"  intent={behavior_state.get('intent', 0):.2f}")
-                    print(f"  alertness={behavior_state.get('alertness', 0):.2f}")
-                    print(f"  threat={behavior_state.get('threat', 0):.2f}")
+                    self._log(INFO, "%s:", entity_id)
+                    self._log(INFO, "  intent=%.2f", behavior_state.get('intent', 0))
+                    self._log(INFO, "  alertness=%.2f", behavior_state.get('alertness', 0))
+                    self._log(INFO, "  threat=%.2f", behavior_state.get('threat', 0))
     
     def add_command(self, cmd: Dict[str, Any]):
-        self.command_queue.append(cmd)
+        with self._lock:
+            self.command_queue.append(cmd)
     
     def build_snapshot_pack(self):
-        """Build snapshot pack for kernel invocation"""
-        state = copy.deepcopy(self.snapshot)
+        """Build snapshot pack for kernel invocation.
+
+        Only the passthrough slices are picked (no deepcopy of the whole
+        snapshot) - kernels read foreign state and return deltas, they never
+        mutate it. The same pack dict is rebound every tick, so it is a view
+        valid for the current tick only.
+        """
+        state = self.snapshot
         
         # Passthrough slices for subsystems
-        pack = {
-            "inventory3d": state.get("inventory3d", {}),
-            "combat3d": state.get("combat3d", {}),
-            "dialogue3d": state.get("dialogue3d", {}),
-        }
+        pack = self._snapshot_pack
+        for k in pack:
+            pack[k] = state.get(k, _EMPTY_SLICE)
         
         if getattr(self, "debug", False):
             pack = deep_freeze(pack)
@@ -715,7 +1022,12 @@ class EngAInRuntime:
     
     def _run_kernel(self, domain, kernel_fn, intent, snapshot_pack, rng, tick):
         """Run a kernel with strict contract enforcement"""
-        own_state = copy.deepcopy(self.snapshot.get(domain, {}))
+        # Read-only shallow view instead of a deepcopy: kernels return deltas
+        domain_state = self.snapshot.get(domain, {})
+        own_state = MappingProxyType(dict(domain_state))
+        
+        if self.debug:
+            before = stable_hash((domain_state, snapshot_pack))
 
         result = kernel_fn(
             intent=intent,
@@ -724,6 +1036,9 @@ class EngAInRuntime:
             rng_seed=rng,
             now_tick=tick,
         )
+        
+        if self.debug and stable_hash((domain_state, snapshot_pack)) != before:
+            raise KernelContractError(f"{domain} mutated its input state")
 
         if not isinstance(result, dict):
             raise KernelContractError(f"{domain} returned non-dict: {type(result)}")
@@ -755,207 +1070,312 @@ class EngAInRuntime:
 
         return deltas, alerts
     
-    def get_snapshot(self) -> Dict[str, Any]:
-        """Get current snapshot wrapped in protocol envelope"""
-        snapshot = copy.deepcopy(self.snapshot)
-        
-        # Clear ephemeral events AFTER copy
-        self.snapshot["events"] = []
+    def get_snapshot(self, soa: bool = False, since: Optional[float] = None) -> Dict[str, Any]:
+        """Get current snapshot wrapped in protocol envelope.
 
-        # Wrap in protocol envelope with hash
-        tick = snapshot["world"]["time"]
-        # Wrap in protocol envelope with hash
-        tick = snapshot["world"]["time"]
-        
-        if self.combat:
-            snapshot["combat"] = self.combat.get_all_state()
-        
-        if self.inventory:
-            snapshot["inventory"] = self.inventory.get_all_state()
-        
-        if self.dialogue:
-            snapshot["dialogue"] = self.dialogue.get_all_state()
+        soa=True replaces the per-entity dicts of spatially stepped entities
+        with the Spatial3D arrays (see _soa_entities); needs numpy.
+        since=<tick of an earlier snapshot> sends only the entities that
+        changed since then (see _entity_delta), or the full snapshot if that
+        one is no longer retained; the envelope hash covers the full state.
+        """
+        snapshot, tick, base = self._copy_snapshot(soa, since)
+        envelope = self.envelope.wrap_snapshot(snapshot, tick)
+        if base is not None:
+            envelope["payload"] = self._entity_delta(snapshot, since, base)
+        return envelope
+    
+    def get_snapshot_stream(self, group: int = STREAM_CHUNK_ENTITIES):
+        """Full snapshot envelope as JSON byte pieces (see iter_envelope_chunks),
+        serialized and hashed piece by piece instead of through wrap_snapshot"""
+        snapshot, tick, _ = self._copy_snapshot()
+        return iter_envelope_chunks(self.envelope.envelope_meta(tick), snapshot, group)
+    
+    def _copy_snapshot(self, soa: bool = False, since: Optional[float] = None):
+        """(snapshot copy, tick, retained entities at `since` or None);
+        drains the pending events"""
+        # Structural copy only: top level, per-entity dicts and every nested
+        # subsystem state (the sim thread mutates those in place), taken
+        # under the lock. Serialization runs after it is released.
+        base = None
+        with self._lock:
+            snapshot = dict(self.snapshot)
+            if soa and HAS_NUMPY and self._pos is not None:
+                self._soa_entities(snapshot)
+            else:
+                snapshot["entities"] = {eid: dict(e) for eid, e in self.snapshot["entities"].items()}
+                history = self._snapshot_history
+                if since is not None:
+                    base = next((ents for t, ents in history if t == since), None)
+                if history and history[-1][0] == snapshot["world"]["time"]:
+                    history.pop()
+                history.append((snapshot["world"]["time"], snapshot["entities"]))
+            snap_world = snapshot["world"] = dict(self.snapshot["world"])
+            snapshot["events"] = list(self.snapshot["events"])
+            for key in ("spatial", "perception", "behavior"):
+                if key in snapshot:
+                    snapshot[key] = _copy_state(snapshot[key])
             
-        return self.envelope.wrap_snapshot(snapshot, tick)
+            # Clear ephemeral events AFTER copy
+            self.snapshot["events"] = deque(maxlen=EVENTS_MAXLEN)
+
+            tick = snap_world["time"]
+            
+            combat, inventory, dialogue = self.combat, self.inventory, self.dialogue
+            if combat:
+                snapshot["combat"] = _copy_state(combat.get_all_state())
+            
+            if inventory:
+                snapshot["inventory"] = _copy_state(inventory.get_all_state())
+            
+            if dialogue:
+                snapshot["dialogue"] = _copy_state(dialogue.get_all_state())
+        
+        return snapshot, tick, base
+    
+    def _entity_delta(self, snapshot: Dict[str, Any], since: float,
+                      base: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Payload with entities replaced by the changes against `base`,
+        the entity copies retained from the snapshot at tick `since`"""
+        entities = snapshot["entities"]
+        payload = {k: v for k, v in snapshot.items() if k != "entities"}
+        payload["base_tick"] = since
+        payload["delta"] = {eid: e for eid, e in entities.items() if base.get(eid) != e}
+        payload["removed"] = [eid for eid in base if eid not in entities]
+        return payload
+    
+    def _soa_entities(self, snapshot: Dict[str, Any]):
+        """Compact entity form for get_snapshot(soa=True).
+
+        Entities with a Spatial3D row are emitted column-wise as
+        entity_ids / entities_pos / entities_vel arrays (copied out of the
+        SoA store, no per-entity dicts) plus entities_health, a list of the
+        entities' own health values so ints stay ints on the wire;
+        "entities" keeps full dicts only for entities without a row yet.
+        """
+        entities = self.snapshot["entities"]
+        n = len(self._eid_rows)
+        ids = list(self._eid_rows)
+        snapshot["entity_ids"] = ids
+        snapshot["entities_pos"] = self._pos[:n].copy()
+        snapshot["entities_vel"] = self._vel[:n].copy()
+        snapshot["entities_health"] = [entities[eid]["health"] if eid in entities else 0 for eid in ids]
+        index = self._eid_index
+        snapshot["entities"] = {eid: dict(e) for eid, e in entities.items() if eid not in index}
+    
+    @property
+    def running(self) -> bool:
+        return not self._stop.is_set()
+    
+    def submit_post(self, path: str, body: bytes):
+        """Queue a raw POST for the worker (async_post mode)"""
+        self._post_queue.put((path, body))
+    
+    def _post_loop(self):
+        while True:
+            item = self._post_queue.get()
+            if item is None:
+                return
+            path, body = item
+            try:
+                self._apply_post(path, loads_bytes(body))
+            except json.JSONDecodeError:
+                self._log(WARNING, "[POST] %s: invalid JSON dropped", path)
+            except Exception as e:
+                self._log(ERROR, "[POST ERROR] %s: %s", path, e)
+    
+    def _apply_post(self, path: str, data: Any) -> bool:
+        """Apply a parsed POST body; False if its subsystem isn't loaded"""
+        if path == "/command":
+            self.add_command(data)
+            return True
+        attr, delta_type, ack_status, make_payload = ROUTES[path]
+        subsystem = getattr(self, attr)
+        if not subsystem:
+            return False
+        payload = make_payload(data) if make_payload else data
+        with self._lock:
+            subsystem.handle_delta(delta_type, payload)
+        return True
     
     def shutdown(self):
-        self.running = False
+        self._stop.set()
         self.sim_thread.join()
+        if self._post_worker:
+            self._post_queue.put(None)
+            self._post_worker.join()
+        if self._log_listener:
+            self._log_listener.stop()
+
+
+def _damage_payload(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "source": data.get("source", "unknown"),
+        "target": data.get("target"),
+        "amount": data.get("damage", 25)
+    }
+
+def _item_payload(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {"actor": data.get("actor"), "item": data.get("item")}
+
+def _drop_payload(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "actor": data.get("actor"),
+        "item": data.get("item"),
+        "location": data.get("location", "world")
+    }
+
+# Direct subsystem POST routes:
+# path -> (runtime attribute, delta type, ack status, payload builder or None = body as-is)
+ROUTES = {
+    "/combat/damage": ("combat", "combat3d/apply_damage", "damage_applied", _damage_payload),
+    "/inventory/take": ("inventory", "inventory3d/take", "take_queued", _item_payload),
+    "/inventory/drop": ("inventory", "inventory3d/drop", "drop_queued", _drop_payload),
+    "/inventory/wear": ("inventory", "inventory3d/wear", "wear_queued", _item_payload),
+    "/dialogue/say": ("dialogue", "dialogue3d/say", "say_queued", None),
+    "/dialogue/ask": ("dialogue", "dialogue3d/ask", "ask_queued", None),
+}
+
+def iter_envelope_chunks(meta: Dict[str, Any], payload: Dict[str, Any],
+                         group: int = STREAM_CHUNK_ENTITIES):
+    """Yield an envelope as JSON byte pieces that concatenate to one document:
+    metadata + payload without entities, then `group` entities per piece,
+    then "hash" last. The hash is the sha256 of the payload text exactly as
+    sent, fed piece by piece - only one piece is ever serialized at a time."""
+    h = hashlib.sha256()
+    entities = payload.get("entities", {})
+    rest = {k: v for k, v in payload.items() if k != "entities"}
+    rest_bytes = dumps_bytes(rest)[:-1]
+    head = rest_bytes + (b',' if len(rest_bytes) > 1 else b'') + b'"entities":{'
+    h.update(head)
+    yield dumps_bytes(meta)[:-1] + b',"payload":' + head
+    
+    items = iter(entities.items())
+    sep = b""
+    while True:
+        batch = dict(islice(items, group))
+        if not batch:
+            break
+        piece = sep + dumps_bytes(batch)[1:-1]
+        h.update(piece)
+        yield piece
+        sep = b","
+    h.update(b"}}")
+    yield b'}},"hash":"' + h.hexdigest().encode() + b'"}'
+
+# Preformatted head for _send_json_response (%d = Content-Length)
+_JSON_200_HEAD = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: %d\r\n"
+    b"\r\n"
+)
+
+_JSON_200_CHUNKED_HEAD = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Transfer-Encoding: chunked\r\n"
+    b"\r\n"
+)
 
 
 class RuntimeHTTPHandler(BaseHTTPRequestHandler):
     runtime: EngAInRuntime = None
+    # Keep-alive: clients reuse one connection across /snapshot polls
+    protocol_version = "HTTP/1.1"
+    # Idle keep-alive connections are dropped after this many seconds
+    timeout = KEEPALIVE_TIMEOUT
     
     def do_GET(self):
-        if self.path == "/snapshot":
-            envelope = self.runtime.get_snapshot()
-            self._send_json_response(envelope)
+        path, _, query = self.path.partition("?")
+        if path == "/snapshot":
+            params = parse_qs(query)
+            soa = params.get("format", [""])[0] == "soa"
+            since = params.get("since")
+            try:
+                since = float(since[0]) if since else None
+            except ValueError:
+                self.send_error(400, "Invalid since")
+                return
+            self._send_json_response(self.runtime.get_snapshot(soa=soa, since=since))
+        elif path == "/snapshot/stream":
+            # Large worlds: never hold the whole serialized snapshot at once
+            self._send_json_chunked(self.runtime.get_snapshot_stream())
         else:
             self.send_error(404)
 
     
     def do_POST(self):
-        if self.path == "/command":
-            content_length = int(self.headers['Content-Length'])
-            body = self.rfile.read(content_length)
-            
-            try:
-                command = json.loads(body.decode('utf-8'))
-                self.runtime.add_command(command)
-                response = {"type": "ack", "status": "ok"}
-                self._send_json_response(response)
-            except json.JSONDecodeError:
-                self.send_error(400, "Invalid JSON")
+        content_length = int(self.headers['Content-Length'])
+        body = self.rfile.read(content_length)
         
-        elif self.path == "/combat/damage":
-            content_length = int(self.headers['Content-Length'])
-            body = self.rfile.read(content_length)
-            
-            try:
-                data = json.loads(body.decode('utf-8'))
-                source = data.get("source", "unknown")
-                target = data.get("target")
-                damage = data.get("damage", 25)
-                
-                if self.runtime.combat:
-                    self.runtime.combat.handle_delta("combat3d/apply_damage", {
-                        "source": source,
-                        "target": target,
-                        "amount": damage
-                    })
-                    response = {"type": "ack", "status": "damage_applied"}
-                else:
-                    response = {"type": "error", "status": "combat_not_loaded"}
-                
-                self._send_json_response(response)
-            except json.JSONDecodeError:
-                self.send_error(400, "Invalid JSON")
-
-        elif self.path == "/inventory/take":
-            content_length = int(self.headers['Content-Length'])
-            body = self.rfile.read(content_length)
-            
-            try:
-                data = json.loads(body.decode('utf-8'))
-                actor = data.get("actor")
-                item = data.get("item")
-                
-                if self.runtime.inventory:
-                    self.runtime.inventory.handle_delta("inventory3d/take", {
-                        "actor": actor,
-                        "item": item
-                    })
-                    response = {"type": "ack", "status": "take_queued"}
-                else:
-                    response = {"type": "error", "status": "inventory_not_loaded"}
-                
-                self._send_json_response(response)
-            except json.JSONDecodeError:
-                self.send_error(400, "Invalid JSON")
-
-        elif self.path == "/inventory/drop":
-            content_length = int(self.headers['Content-Length'])
-            body = self.rfile.read(content_length)
-            
-            try:
-                data = json.loads(body.decode('utf-8'))
-                actor = data.get("actor")
-                item = data.get("item")
-                location = data.get("location", "world")
-                
-                if self.runtime.inventory:
-                    self.runtime.inventory.handle_delta("inventory3d/drop", {
-                        "actor": actor,
-                        "item": item,
-                        "location": location
-                    })
-                    response = {"type": "ack", "status": "drop_queued"}
-                else:
-                    response = {"type": "error", "status": "inventory_not_loaded"}
-                
-                self._send_json_response(response)
-            except json.JSONDecodeError:
-                self.send_error(400, "Invalid JSON")
-
-        elif self.path == "/inventory/wear":
-            content_length = int(self.headers['Content-Length'])
-            body = self.rfile.read(content_length)
-            
-            try:
-                data = json.loads(body.decode('utf-8'))
-                actor = data.get("actor")
-                item = data.get("item")
-                
-                if self.runtime.inventory:
-                    self.runtime.inventory.handle_delta("inventory3d/wear", {
-                        "actor": actor,
-                        "item": item
-                    })
-                    response = {"type": "ack", "status": "wear_queued"}
-                else:
-                    response = {"type": "error", "status": "inventory_not_loaded"}
-                
-                self._send_json_response(response)
-            except json.JSONDecodeError:
-                self.send_error(400, "Invalid JSON")
-
-        elif self.path == "/dialogue/say":
-            content_length = int(self.headers['Content-Length'])
-            body = self.rfile.read(content_length)
-            
-            try:
-                data = json.loads(body.decode('utf-8'))
-                
-                if self.runtime.dialogue:
-                    self.runtime.dialogue.handle_delta("dialogue3d/say", data)
-                    response = {"type": "ack", "status": "say_queued"}
-                else:
-                    response = {"type": "error", "status": "dialogue_not_loaded"}
-                
-                self._send_json_response(response)
-            except json.JSONDecodeError:
-                self.send_error(400, "Invalid JSON")
-
-        elif self.path == "/dialogue/ask":
-            content_length = int(self.headers['Content-Length'])
-            body = self.rfile.read(content_length)
-            
+        path = self.path
+        if path == "/command":
+            attr, ack_status = None, "ok"
+        elif path in ROUTES:
+            attr, _, ack_status, _ = ROUTES[path]
+        else:
+            self.send_error(404)
+            return
+        
+        runtime = self.runtime
+        if attr and not getattr(runtime, attr):
+            self._send_json_response({"type": "error", "status": f"{attr}_not_loaded"})
+            return
+        
+        if runtime.async_post:
+            # Ack now; the worker parses and applies in arrival order
+            runtime.submit_post(path, body)
+        else:
             try:
-                data = json.loads(body.decode('utf-8'))
-                
-                if self.runtime.dialogue:
-                    self.runtime.dialogue.handle_delta("dialogue3d/ask", data)
-                    response = {"type": "ack", "status": "ask_queued"}
-                else:
-                    response = {"type": "error", "status": "dialogue_not_loaded"}
-                
-                self._send_json_response(response)
+                data = loads_bytes(body)
             except json.JSONDecodeError:
                 self.send_error(400, "Invalid JSON")
-
-        else:
-            self.send_error(404)
+                return
+            if not runtime._apply_post(path, data):
+                self._send_json_response({"type": "error", "status": f"{attr}_not_loaded"})
+                return
+        
+        self._send_json_response({"type": "ack", "status": ack_status})
     
     def _send_json_response(self, data: Dict[str, Any]):
-        response_json = json.dumps(data)
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Content-Length', len(response_json))
-        self.end_headers()
-        self.wfile.write(response_json.encode('utf-8'))
+        self._send_json_bytes(dumps_bytes(data))
+    
+    def _send_json_chunked(self, pieces):
+        # Transfer-Encoding: chunked - one HTTP chunk per serialized piece
+        self.log_request(200)
+        write = self.wfile.write
+        write(_JSON_200_CHUNKED_HEAD)
+        for piece in pieces:
+            write(b"%X\r\n%s\r\n" % (len(piece), piece))
+        write(b"0\r\n\r\n")
+    
+    def _send_json_bytes(self, body: bytes):
+        # Status line, headers and body go out in a single write
+        self.log_request(200)
+        self.wfile.write(_JSON_200_HEAD % len(body) + body)
     
     def log_message(self, format, *args):
         pass
 
 
+def make_server(runtime: EngAInRuntime, address=('localhost', 8080)) -> ThreadingHTTPServer:
+    """HTTP front-end for a runtime - one thread per connection, so a slow
+    /snapshot never blocks /command POSTs"""
+    RuntimeHTTPHandler.runtime = runtime
+    server = ThreadingHTTPServer(address, RuntimeHTTPHandler)
+    # Keep-alive connections park a thread each; never let them block exit
+    server.daemon_threads = True
+    return server
+
+
 def main():
     print("=" * 50)
     print("EngAIn Runtime Server")
     print("=" * 50)
     
     runtime = EngAInRuntime()
-    RuntimeHTTPHandler.runtime = runtime
-    server = HTTPServer(('localhost', 8080), RuntimeHTTPHandler)
+    server = make_server(runtime)
     
     print("\nServer running on http://localhost:8080")
     print("Press Ctrl+C to stop\n")
@@ -966,6 +1386,7 @@ def main():
         print("\nShutting down...")
         runtime.shutdown()
         server.shutdown()
+        server.server_close()
         print("Goodbye!")
 
 
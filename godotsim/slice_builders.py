@@ -5,8 +5,25 @@ All validation/normalization happens here, never in kernels
 CONTAMINATION GUARD: This module is the ONLY place allowed to read raw snapshot dicts.
 MR kernels MUST receive typed slices. Any violation is a critical architecture bug.
 """
+import sys
+from collections.abc import Mapping
 from typing import Any, Dict, Iterable, Optional, Tuple
-from slice_types import EntityKViewV1, SpatialSliceV1, PerceptionSliceV1, BehaviorSliceV1, NavigationSliceV1, Vec3
+from slice_types import (
+    EntityKViewV1, SpatialSliceV1, SpatialSliceV1Batched,
+    PerceptionSliceV1, BehaviorSliceV1, NavigationSliceV1, Vec3,
+)
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+if HAS_NUMPY:
+    from slice_builders_fast import nearest_k
+
+# Neighbour count above which build_spatial_slice_v1_batched beats per-entity views
+BATCH_NEARBY_MIN = 8
 
 class SliceError(ValueError):
     """Raised when snapshot doesn't match contract"""
@@ -41,8 +58,20 @@ def assert_no_raw_dict_contamination(value: Any, context: str):
         # Could be a legitimate dict field (like flags), so just warn
         pass  # Allow for now, but could be stricter
 
+# Upper bound on a caller-owned kview cache; it is emptied when full
+KVIEW_CACHE_MAX = 65536
+
 def _as_vec3(value: Any, *, field: str, eid: str) -> Vec3:
     """Convert to Vec3 or raise SliceError"""
+    # Fast path: three numbers (x * 1.0 coerces ints without a float() call)
+    try:
+        x, y, z = value
+        return (x * 1.0, y * 1.0, z * 1.0)
+    except (TypeError, ValueError):
+        return _as_vec3_slow(value, field=field, eid=eid)
+
+def _as_vec3_slow(value: Any, *, field: str, eid: str) -> Vec3:
+    """Validating path for anything that isn't three plain numbers"""
     if value is None:
         return (0.0, 0.0, 0.0)
     
@@ -54,35 +83,21 @@ def _as_vec3(value: Any, *, field: str, eid: str) -> Vec3:
     except (ValueError, TypeError) as e:
         raise SliceError(f"{field} non-numeric for {eid}: {value}") from e
 
-def build_entity_kview_v1(
-    world: Dict[str, Any], 
-    eid: str, 
-    *, 
-    normalize_missing_vel: bool = True
+def _kview_from_raw(
+    e: Mapping,
+    eid: str,
+    pos_raw: Any,
+    vel_raw: Any,
+    rot_raw: Any,
+    normalize_missing_vel: bool
 ) -> EntityKViewV1:
-    """
-    Build guaranteed EntityKViewV1 from raw snapshot.
-    This is the ONLY place allowed to read world["entities"][eid]
-    """
-    entities = world.get("entities")
-    if not isinstance(entities, dict):
-        raise SliceError(f"world.entities missing or not dict")
-    
-    if eid not in entities:
-        raise SliceError(f"entity {eid} not found in snapshot")
-    
-    e = entities[eid]
-    if not isinstance(e, dict):
-        raise SliceError(f"entity {eid} is not dict")
-    
+    """Validate already-probed pos/vel/rot values and build the view"""
     # Position - REQUIRED
-    pos_raw = e.get("pos") or e.get("position")
     if pos_raw is None:
         raise SliceError(f"position missing for {eid}")
     pos = _as_vec3(pos_raw, field="position", eid=eid)
     
     # Velocity - normalize to (0,0,0) if missing
-    vel_raw = e.get("vel") or e.get("velocity")
     if vel_raw is None:
         if normalize_missing_vel:
             vel = (0.0, 0.0, 0.0)
@@ -92,7 +107,6 @@ def build_entity_kview_v1(
         vel = _as_vec3(vel_raw, field="velocity", eid=eid)
     
     # Rotation - optional
-    rot_raw = e.get("rot") or e.get("rotation")
     rot = _as_vec3(rot_raw, field="rotation", eid=eid) if rot_raw else (0.0, 0.0, 0.0)
     
     # Health
@@ -114,38 +128,227 @@ def build_entity_kview_v1(
         flags=flags
     )
 
+def _build_kview_any(e: Mapping, eid: str, normalize_missing_vel: bool) -> EntityKViewV1:
+    """Unknown naming - kernel name first, protocol name as fallback"""
+    return _kview_from_raw(
+        e, eid,
+        e.get("pos") or e.get("position"),
+        e.get("vel") or e.get("velocity"),
+        e.get("rot") or e.get("rotation"),
+        normalize_missing_vel
+    )
+
+def _build_kview_kernel(e: Mapping, eid: str, normalize_missing_vel: bool) -> EntityKViewV1:
+    """Kernel-named entity (pos/vel/rot) - one probe per field"""
+    return _kview_from_raw(e, eid, e.get("pos"), e.get("vel"), e.get("rot"), normalize_missing_vel)
+
+def _build_kview_protocol(e: Mapping, eid: str, normalize_missing_vel: bool) -> EntityKViewV1:
+    """Protocol-named entity (position/velocity/rotation) - one probe per field"""
+    return _kview_from_raw(
+        e, eid, e.get("position"), e.get("velocity"), e.get("rotation"), normalize_missing_vel
+    )
+
+_KVIEW_BUILDERS = {
+    None: _build_kview_any,
+    "kernel": _build_kview_kernel,
+    "protocol": _build_kview_protocol,
+}
+
+def build_entity_kview_v1(
+    world: Dict[str, Any], 
+    eid: str, 
+    *, 
+    normalize_missing_vel: bool = True,
+    names: Optional[str] = None,
+    cache: Optional[Dict[Tuple[str, bool, Optional[str]], EntityKViewV1]] = None
+) -> EntityKViewV1:
+    """
+    Build guaranteed EntityKViewV1 from raw snapshot.
+    This is the ONLY place allowed to read world["entities"][eid]
+    
+    names: "kernel" (pos/vel/rot) or "protocol" (position/velocity/rotation)
+    when the caller knows how the snapshot names vectors; None probes both.
+    
+    cache: optional dict memoizing views for this one world. The caller
+    owns it and must drop it whenever the world's entities change.
+    """
+    if type(eid) is str:
+        eid = sys.intern(eid)  # views carry the interned id onward
+    if cache is not None:
+        key = (eid, normalize_missing_vel, names)
+        view = cache.get(key)
+        if view is not None:
+            return view
+    
+    builder = _KVIEW_BUILDERS.get(names)
+    if builder is None:
+        raise ValueError(f"unknown kview naming: {names!r}")
+    
+    entities = world.get("entities")
+    if not isinstance(entities, dict):
+        raise SliceError(f"world.entities missing or not dict")
+    
+    if eid not in entities:
+        raise SliceError(f"entity {eid} not found in snapshot")
+    
+    e = entities[eid]
+    if not isinstance(e, Mapping):
+        raise SliceError(f"entity {eid} is not a mapping")
+    
+    view = builder(e, eid, normalize_missing_vel)
+    if cache is not None:
+        if len(cache) >= KVIEW_CACHE_MAX:
+            cache.clear()
+        cache[key] = view
+    return view
+
+def build_entity_kview_batch(
+    world: Dict[str, Any],
+    eids: Iterable[str]
+) -> Tuple[Any, Any, Any, Tuple[Dict[str, Any], ...]]:
+    """
+    Batched kernel view: one pass over world["entities"] filling
+    (pos (N,3), vel (N,3), health (N,), flags) - same validation and
+    normalization as build_entity_kview_v1, no per-entity dataclass.
+    """
+    if not HAS_NUMPY:
+        raise SliceError("build_entity_kview_batch requires numpy")
+    
+    entities = world.get("entities")
+    if not isinstance(entities, dict):
+        raise SliceError(f"world.entities missing or not dict")
+    
+    eids = tuple(eids)
+    n = len(eids)
+    pos = np.empty((n, 3), dtype=np.float64)
+    vel = np.zeros((n, 3), dtype=np.float64)
+    health = np.empty(n, dtype=np.float64)
+    flags_list = []
+    
+    for i, eid in enumerate(eids):
+        e = entities.get(eid)
+        if e is None:
+            raise SliceError(f"entity {eid} not found in snapshot")
+        if not isinstance(e, Mapping):
+            raise SliceError(f"entity {eid} is not a mapping")
+        
+        pos_raw = e.get("pos") or e.get("position")
+        if pos_raw is None:
+            raise SliceError(f"position missing for {eid}")
+        pos[i] = _as_vec3(pos_raw, field="position", eid=eid)
+        
+        vel_raw = e.get("vel") or e.get("velocity")
+        if vel_raw is not None:
+            vel[i] = _as_vec3(vel_raw, field="velocity", eid=eid)
+        
+        health[i] = float(e.get("health", 100.0))
+        
+        flags = e.get("flags", {})
+        flags_list.append(flags if isinstance(flags, dict) else {})
+    
+    return pos, vel, health, tuple(flags_list)
+
+def _spatial_neighbours(
+    world: Dict[str, Any],
+    eid: str,
+    nearby_eids: Optional[Iterable[str]],
+    k_nearest: int
+) -> Tuple[str, ...]:
+    """Explicit neighbour ids, or the k nearest entities when asked for"""
+    if k_nearest > 0 and nearby_eids is None and HAS_NUMPY:
+        soa = world.get("spatial_soa")
+        row = None
+        if isinstance(soa, dict) and "ids" in soa:
+            ids = soa["ids"]
+            index = soa.get("index")
+            if index is None:
+                # Built once per published SoA, then shared by every slice
+                index = soa["index"] = {sid: i for i, sid in enumerate(ids)}
+            row = index.get(eid)
+        if row is not None:
+            pos = soa["pos"]
+        else:
+            ids = tuple(world["entities"])
+            pos = build_entity_kview_batch(world, ids)[0]
+            row = ids.index(eid)  # linear, like the batch pass above
+        nearby_eids = [ids[j] for j in nearest_k(pos, row, k_nearest)]
+    return tuple(nearby_eids) if nearby_eids else ()
+
+def _spatial_world_meta(world: Dict[str, Any]) -> Dict[str, Any]:
+    world_meta = world.get("spatial", {})
+    return world_meta if isinstance(world_meta, dict) else {}
+
 def build_spatial_slice_v1(
     world: Dict[str, Any],
     tick: float,
     eid: str,
     *,
-    nearby_eids: Optional[Iterable[str]] = None
+    nearby_eids: Optional[Iterable[str]] = None,
+    k_nearest: int = 0,
+    cache: Optional[Dict] = None
 ) -> SpatialSliceV1:
-    """Build spatial slice for one entity"""
-    self_view = build_entity_kview_v1(world, eid)
+    """
+    Build spatial slice for one entity.
     
-    nearby = ()
-    if nearby_eids:
-        nearby = tuple(build_entity_kview_v1(world, nid) for nid in nearby_eids)
+    k_nearest > 0 (numpy only, no nearby_eids) picks the k nearest
+    entities as neighbours. Positions come from world["spatial_soa"]
+    ({"ids": [...], "pos": (N, 3), "index": {eid: row}}) when the owner
+    caches one there, otherwise from a batched kview pass over all
+    entities. A missing "index" is built and stored in that dict, so
+    publish a new dict whenever ids change.
     
-    world_meta = world.get("spatial", {})
-    if not isinstance(world_meta, dict):
-        world_meta = {}
+    cache: caller-owned kview memo, see build_entity_kview_v1.
+    """
+    self_view = build_entity_kview_v1(world, eid, cache=cache)
+    nearby_eids = _spatial_neighbours(world, eid, nearby_eids, k_nearest)
     
     return SpatialSliceV1(
         tick=tick,
         self=self_view,
-        nearby=nearby,
-        world=world_meta
+        nearby=tuple(build_entity_kview_v1(world, nid, cache=cache) for nid in nearby_eids),
+        world=_spatial_world_meta(world)
+    )
+
+def build_spatial_slice_v1_batched(
+    world: Dict[str, Any],
+    tick: float,
+    eid: str,
+    *,
+    nearby_eids: Optional[Iterable[str]] = None,
+    k_nearest: int = 0,
+    cache: Optional[Dict] = None
+) -> SpatialSliceV1Batched:
+    """
+    Same as build_spatial_slice_v1, with the neighbours as arrays
+    (needs numpy). Worth it past BATCH_NEARBY_MIN neighbours.
+    """
+    if not HAS_NUMPY:
+        raise SliceError("build_spatial_slice_v1_batched requires numpy")
+    
+    self_view = build_entity_kview_v1(world, eid, cache=cache)
+    nearby_eids = _spatial_neighbours(world, eid, nearby_eids, k_nearest)
+    pos, vel, health, flags = build_entity_kview_batch(world, nearby_eids)
+    
+    return SpatialSliceV1Batched(
+        tick=tick,
+        self=self_view,
+        nearby_ids=nearby_eids,
+        nearby_pos=pos,
+        nearby_vel=vel,
+        nearby_health=health,
+        nearby_flags=flags,
+        world=_spatial_world_meta(world)
     )
 
 def build_perception_slice_v1(
     world: Dict[str, Any],
     tick: float,
-    eid: str
+    eid: str,
+    *,
+    cache: Optional[Dict] = None
 ) -> PerceptionSliceV1:
     """Build perception slice for one entity"""
-    self_view = build_entity_kview_v1(world, eid)
+    self_view = build_entity_kview_v1(world, eid, cache=cache)
     
     perception_data = world.get("perception", {})
     if not isinstance(perception_data, dict):
@@ -172,10 +375,12 @@ def build_perception_slice_v1(
 def build_behavior_slice_v1(
     world: Dict[str, Any],
     tick: float,
-    eid: str
+    eid: str,
+    *,
+    cache: Optional[Dict] = None
 ) -> BehaviorSliceV1:
     """Build behavior slice for one entity"""
-    self_view = build_entity_kview_v1(world, eid)
+    self_view = build_entity_kview_v1(world, eid, cache=cache)
     
     perception_data = world.get("perception", {}).get(eid, {})
     if not isinstance(perception_data, dict):
@@ -197,13 +402,14 @@ def build_nav_slice_v1(
     tick: float,
     eid: str,
     *,
-    goal: Optional[Vec3] = None
+    goal: Optional[Vec3] = None,
+    cache: Optional[Dict] = None
 ) -> NavigationSliceV1:
     """
     Build navigation slice for one entity.
     Guarantees position/velocity exist, normalizes goal.
     """
-    self_view = build_entity_kview_v1(world, eid)
+    self_view = build_entity_kview_v1(world, eid, cache=cache)
     
     # Extract nav grid if present
     nav_data = world.get("spatial", {})
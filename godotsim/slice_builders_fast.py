@@ -0,0 +1,76 @@
+"""
+slice_builders_fast.py - Optional compiled helpers for slice_builders
+Pure array math over SoA positions; never reads raw snapshot dicts
+(slice_builders stays the ONLY place that does).
+"""
+import math
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def nearest_k(pos, self_i: int, k: int):
+    """
+    Indices of the k rows of pos (N, 3) nearest to row self_i, closest
+    first, excluding self_i. Ties keep the lower index first.
+    """
+    n = pos.shape[0]
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if HAS_NUMBA:
+        return _nearest_k_jit(pos, self_i, k)
+
+    diff = pos - pos[self_i]
+    d2 = np.einsum("ij,ij->i", diff, diff)
+    d2[self_i] = np.inf
+    idx = np.argpartition(d2, k - 1)[:k]
+    return idx[np.lexsort((idx, d2[idx]))]
+
+if HAS_NUMBA:
+    @njit(nogil=True, cache=True, parallel=True, fastmath=True)
+    def _nearest_k_jit(pos, self_i, k):
+        """Parallel squared distances, then a k-slot insertion list (k is small)."""
+        n = pos.shape[0]
+        sx = pos[self_i, 0]
+        sy = pos[self_i, 1]
+        sz = pos[self_i, 2]
+        d2 = np.empty(n, dtype=np.float64)
+        for i in prange(n):
+            dx = pos[i, 0] - sx
+            dy = pos[i, 1] - sy
+            dz = pos[i, 2] - sz
+            d2[i] = dx*dx + dy*dy + dz*dz
+
+        best = np.empty(k, dtype=np.int64)
+        best_d = np.full(k, math.inf)
+        filled = 0
+        for i in range(n):
+            if i == self_i:
+                continue
+            d = d2[i]
+            if filled == k and d >= best_d[k - 1]:
+                continue
+            j = filled if filled < k else k - 1
+            while j > 0 and best_d[j - 1] > d:
+                best_d[j] = best_d[j - 1]
+                best[j] = best[j - 1]
+                j -= 1
+            best_d[j] = d
+            best[j] = i
+            if filled < k:
+                filled += 1
+        return best
+
+    # Compile (or load from cache) and start numba's thread pool on the
+    # importing thread - see the matching note in spatial3d_mr.
+    _nearest_k_jit(np.zeros((2, 3), dtype=np.float32), 0, 1)
@@ -7,7 +7,7 @@ from typing import Dict, List, Any, Optional, Tuple
 
 Vec3 = Tuple[float, float, float]
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EntityKViewV1:
     """Kernel view of single entity - guaranteed fields"""
     eid: str
@@ -18,7 +18,7 @@ class EntityKViewV1:
     max_health: float = 100.0
     flags: Dict[str, Any] = field(default_factory=dict)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SpatialSliceV1:
     """Spatial kernel input - self + nearby entities"""
     tick: float
@@ -26,7 +26,20 @@ class SpatialSliceV1:
     nearby: Tuple[EntityKViewV1, ...] = ()
     world: Dict[str, Any] = field(default_factory=dict)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class SpatialSliceV1Batched:
+    """Spatial kernel input - self + nearby entities as (N, 3)/(N,) arrays
+    (from build_spatial_slice_v1_batched, needs numpy)"""
+    tick: float
+    self: EntityKViewV1
+    nearby_ids: Tuple[str, ...] = ()
+    nearby_pos: Any = None
+    nearby_vel: Any = None
+    nearby_health: Any = None
+    nearby_flags: Tuple[Dict[str, Any], ...] = ()
+    world: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass(frozen=True, slots=True)
 class PerceptionSliceV1:
     """Perception kernel input"""
     tick: float
@@ -35,7 +48,7 @@ class PerceptionSliceV1:
     focus_target: Optional[str] = None
     stimuli: Dict[str, Any] = field(default_factory=dict)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BehaviorSliceV1:
     """Behavior kernel input"""
     tick: float
@@ -43,7 +56,7 @@ class BehaviorSliceV1:
     perception: Dict[str, Any] = field(default_factory=dict)
     spatial: Dict[str, Any] = field(default_factory=dict)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NavigationSliceV1:
     """Navigation kernel input - self + goal + nav grid"""
     tick: float
@@ -12,17 +12,70 @@ FIX #2 APPLIED: Protocol-Kernel Naming Boundary
 - Adapter is the translation boundary (no leakage)
 """
 
+import sys
 import time
-from typing import Dict, List, Any, Tuple
+from itertools import islice
+from typing import Dict, List, Any, Optional, Tuple
 
 from spatial3d import Spatial3DStateView, Alert
 from spatial3d_mr import step_spatial3d, SpatialAlert
 
 
+# Initial slots in the pending MR delta buffer (doubles when a tick needs more)
+MR_DELTA_BUDGET = 1024
+
+
 class APViolation(Exception):
     pass
 
 
+def _is_vec3(v) -> bool:
+    return isinstance(v, (list, tuple)) and len(v) == 3
+
+
+def fold_impulses(deltas) -> List[Dict[str, Any]]:
+    """
+    Collapse runs of spatial/apply_impulse on the same entity into one delta.
+    
+    Each run becomes a single impulse carrying sum(impulse / mass) with
+    mass 1.0, placed where the run started. Any other delta touching that
+    entity closes its run, so spawn/teleport/velocity changes still reach
+    the kernel in their original order relative to the impulses.
+    Queued delta dicts are never mutated; folded runs get fresh ones.
+    """
+    out: List[Dict[str, Any]] = []
+    runs: Dict[Any, Tuple[int, int]] = {}   # entity_id -> (index in out, impulses folded)
+    for delta in deltas:
+        payload = delta.get("payload", {})
+        entity_id = payload.get("entity_id")
+        if delta.get("type") != "spatial/apply_impulse" or not _is_vec3(payload.get("impulse")):
+            # Malformed impulses also pass through so the kernel reports them
+            runs.pop(entity_id, None)
+            out.append(delta)
+            continue
+        
+        run = runs.get(entity_id)
+        if run is None:
+            runs[entity_id] = (len(out), 1)
+            out.append(delta)
+            continue
+        
+        i, count = run
+        first = out[i]["payload"]
+        if count == 1:
+            m0 = first.get("mass", 1.0)
+            fx, fy, fz = first["impulse"]
+            first = dict(first, impulse=(fx / m0, fy / m0, fz / m0), mass=1.0)
+            out[i] = dict(out[i], payload=first)
+        
+        mass = payload.get("mass", 1.0)
+        ix, iy, iz = payload["impulse"]
+        fx, fy, fz = first["impulse"]
+        first["impulse"] = (fx + ix / mass, fy + iy / mass, fz + iz / mass)
+        runs[entity_id] = (i, count + 1)
+    return out
+
+
 class Spatial3DStateViewAdapter(Spatial3DStateView):
 
     def __init__(self, state_slice=None):
@@ -32,8 +85,9 @@ class Spatial3DStateViewAdapter(Spatial3DStateView):
         # Explicitly set state slice (in case parent doesn't)
         self._state_slice = state_slice or {"entities": {}}
 
-        # pending MR deltas
-        self._mr_deltas: List[Dict[str, Any]] = []
+        # pending MR deltas: reused buffer, slots [0, _n_deltas) are live
+        self._mr_deltas: List[Optional[Dict[str, Any]]] = [None] * MR_DELTA_BUDGET
+        self._n_deltas = 0
         self._delta_counter = 0
 
 
@@ -53,8 +107,11 @@ class Spatial3DStateViewAdapter(Spatial3DStateView):
         Returns:
             Entity with kernel names (pos, vel)
         """
+        entity_id = protocol_entity['id']
+        if type(entity_id) is str:
+            entity_id = sys.intern(entity_id)
         return {
-            'id': protocol_entity['id'],
+            'id': entity_id,
             'pos': tuple(protocol_entity.get('position', [0.0, 0.0, 0.0])),
             'vel': tuple(protocol_entity.get('velocity', [0.0, 0.0, 0.0])),
             'radius': protocol_entity.get('radius', 0.5),
@@ -83,6 +140,37 @@ class Spatial3DStateViewAdapter(Spatial3DStateView):
             'tags': kernel_entity.get('tags', []),
         }
 
+    def _batch_kernel_to_protocol(self, ids=None) -> Dict[str, List[Any]]:
+        """
+        Translate many kernel entities → protocol names in one pass.
+        
+        EGRESS translation for bulk readers (snapshots): returns columns
+        instead of one protocol dict per entity.
+        
+        Args:
+            ids: Entity ids to include (default: all, in insertion order);
+                 unknown ids are skipped
+        
+        Returns:
+            {"ids", "position", "velocity", "radius", "solid", "tags"} lists,
+            row i of every column describing ids[i]
+        """
+        entities = self._state_slice.get("entities", {})
+        if ids is None:
+            ids = list(entities)
+        else:
+            ids = [eid for eid in ids if eid in entities]
+        rows = [entities[eid] for eid in ids]
+        zero = (0.0, 0.0, 0.0)
+        return {
+            'ids': ids,
+            'position': [list(r.get('pos', zero)) for r in rows],
+            'velocity': [list(r.get('vel', zero)) for r in rows],
+            'radius': [r.get('radius', 0.5) for r in rows],
+            'solid': [r.get('solid', True) for r in rows],
+            'tags': [r.get('tags', []) for r in rows],
+        }
+
 
     # ===============================================================
     # CANONICAL DEEP-LAYER INTERFACE (Pattern A)
@@ -98,7 +186,11 @@ class Spatial3DStateViewAdapter(Spatial3DStateView):
 
         mr_delta = self._convert_to_mr(delta_type, payload)
         if mr_delta:
-            self._mr_deltas.append(mr_delta)
+            n = self._n_deltas
+            if n == len(self._mr_deltas):
+                self._mr_deltas.extend([None] * n)
+            self._mr_deltas[n] = mr_delta
+            self._n_deltas = n + 1
 
         return True, alerts
 
@@ -112,15 +204,15 @@ class Spatial3DStateViewAdapter(Spatial3DStateView):
 
         snapshot_out, accepted, mr_alerts = step_spatial3d(
             snapshot_in,
-            self._mr_deltas,
+            fold_impulses(islice(self._mr_deltas, self._n_deltas)),
             delta_time
         )
 
         # update state (KERNEL NAMES preserved)
         self._state_slice = snapshot_out["spatial3d"]
 
-        # clear deltas
-        self._mr_deltas.clear()
+        # clear deltas (slots are overwritten by the next tick's deltas)
+        self._n_deltas = 0
 
         # convert MR alerts → runtime alerts
         alerts = []
@@ -160,6 +252,9 @@ class Spatial3DStateViewAdapter(Spatial3DStateView):
         """
         from fix_1_snapshot_purity import create_entity_state
         
+        if type(entity_id) is str:
+            entity_id = sys.intern(entity_id)
+        
         # Create entity with PROTOCOL NAMES (position, velocity)
         protocol_entity = create_entity_state(
             entity_id=entity_id,
@@ -222,6 +317,20 @@ class Spatial3DStateViewAdapter(Spatial3DStateView):
         # This enforces the boundary: external API ALWAYS sees protocol names
         return self._kernel_to_protocol(kernel_entity)
 
+    def get_entities(self, ids=None) -> Dict[str, List[Any]]:
+        """
+        Query many entities at once, column-wise, with PROTOCOL NAMES.
+        
+        Bulk counterpart of get_entity for snapshot-style readers.
+        
+        Args:
+            ids: Entity ids (default: all)
+        
+        Returns:
+            Columns - see _batch_kernel_to_protocol
+        """
+        return self._batch_kernel_to_protocol(ids)
+
 
     # ===============================================================
     # DELTA CONVERSION (Deep → MR)
@@ -9,8 +9,31 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Tuple, Iterable, Optional, Any
 import math
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 Vec3 = Tuple[float, float, float]
 
+# Gameplay physics does not need float64 - halves bandwidth for the SoA path
+SPATIAL_DTYPE = np.float32 if HAS_NUMPY else None
+
+# Kernel limits shared with callers that need to reason about reach
+MAX_SPEED = 100.0
+DEFAULT_RADIUS = 0.5
+
+# broadphase_pairs checks candidate pairs in blocks of at most this many
+BROADPHASE_BLOCK = 65536
+
 @dataclass
 class SpatialEntity:
     id: str
@@ -78,6 +101,40 @@ def step_spatial3d(
     return snapshot_out, accepted, alerts
 
 
+def step_spatial3d_arr(
+    ids: List[str],
+    pos: "np.ndarray",
+    vel: "np.ndarray",
+    dt: float,
+    gravity: Vec3 = (0.0, -9.81, 0.0),
+    radius: float = DEFAULT_RADIUS,
+    bounds_min: Vec3 = (-100.0, -100.0, -100.0),
+    bounds_max: Vec3 = (100.0, 100.0, 100.0),
+) -> Tuple["np.ndarray", "np.ndarray", List[SpatialAlert]]:
+    """
+    SoA variant of step_spatial3d for uniform solid entities.
+    Same physics (integrate -> collide -> bounds) over (N, 3) arrays,
+    row i belongs to ids[i]. Inputs are not mutated.
+    
+    Returns:
+        pos_out: Updated (N, 3) positions
+        vel_out: Updated (N, 3) velocities
+        alerts: Physics events
+    """
+    if not HAS_NUMPY:
+        raise RuntimeError("step_spatial3d_arr requires numpy")
+    
+    alerts: List[SpatialAlert] = []
+    pos = np.array(pos, dtype=SPATIAL_DTYPE, copy=True).reshape(-1, 3)
+    vel = np.array(vel, dtype=SPATIAL_DTYPE, copy=True).reshape(-1, 3)
+    
+    _integrate_physics_arr(pos, vel, dt, gravity)
+    _resolve_collisions_arr(ids, pos, vel, radius, alerts)
+    _enforce_bounds_arr(pos, vel, radius, bounds_min, bounds_max)
+    
+    return pos, vel, alerts
+
+
 # ===== Internal Implementation =====
 
 def _parse_world(data: dict) -> SpatialWorld:
@@ -233,6 +290,57 @@ def _integrate_physics(world: SpatialWorld, dt: float, gravity: Vec3, alerts: li
         entity.vel = (vx, vy, vz)
         entity.pos = (px, py, pz)
 
+def _integrate_physics_arr(pos, vel, dt: float, gravity: Vec3):
+    """Vectorized _integrate_physics over SoA arrays (in place)."""
+    if HAS_NUMBA:
+        gx, gy, gz = gravity
+        _integrate_physics_jit(pos, vel, dt, gx, gy, gz)
+        return
+    
+    vel += np.asarray(gravity, dtype=vel.dtype) * dt
+    vel *= 0.98
+    
+    # Clamp speed
+    speed_sq = np.einsum("ij,ij->i", vel, vel)
+    fast = speed_sq > MAX_SPEED*MAX_SPEED
+    if fast.any():
+        vel[fast] *= (MAX_SPEED / np.sqrt(speed_sq[fast]))[:, None]
+    
+    pos += vel * dt
+
+if HAS_NUMBA:
+    @njit(nogil=True, cache=True, parallel=True)
+    def _integrate_physics_jit(pos, vel, dt, gx, gy, gz):
+        """Per-entity integration loop; plain arrays + floats only, so the GIL is released."""
+        for i in prange(pos.shape[0]):
+            # Apply gravity + damping
+            vx = (vel[i, 0] + gx * dt) * 0.98
+            vy = (vel[i, 1] + gy * dt) * 0.98
+            vz = (vel[i, 2] + gz * dt) * 0.98
+            
+            # Clamp speed
+            speed_sq = vx*vx + vy*vy + vz*vz
+            if speed_sq > MAX_SPEED*MAX_SPEED:
+                scale = MAX_SPEED / math.sqrt(speed_sq)
+                vx *= scale
+                vy *= scale
+                vz *= scale
+            
+            vel[i, 0] = vx
+            vel[i, 1] = vy
+            vel[i, 2] = vz
+            pos[i, 0] += vx * dt
+            pos[i, 1] += vy * dt
+            pos[i, 2] += vz * dt
+    
+    # Compile (or load from cache) and start numba's thread pool on the
+    # importing thread - the TBB layer hangs at interpreter exit if its pool
+    # is first started from the sim thread.
+    _integrate_physics_jit(
+        np.zeros((1, 3), dtype=SPATIAL_DTYPE), np.zeros((1, 3), dtype=SPATIAL_DTYPE),
+        0.0, 0.0, 0.0, 0.0,
+    )
+
 def _resolve_collisions(world: SpatialWorld, alerts: list):
     """Resolve collisions deterministically."""
     ids = sorted(world.entities.keys())
@@ -275,6 +383,115 @@ def _resolve_collisions(world: SpatialWorld, alerts: list):
                     (a.id, b.id)
                 ))
 
+def broadphase_pairs(a, reach: float, b=None, block: int = BROADPHASE_BLOCK):
+    """
+    Sort-and-sweep broadphase over (N, 3) positions. Yields (i, j) index
+    arrays of the row pairs closer than reach: rows of a against rows of
+    b, or each distinct pair within a once when b is None.
+    Only pairs within reach along the widest axis are measured, a block
+    at a time, so temporaries stay O(N + block) rather than N x M x 3.
+    """
+    same = b is None
+    if same:
+        b = a
+    if len(a) == 0 or len(b) == 0:
+        return
+    
+    axis = int(np.ptp(b, axis=0).argmax())
+    order = np.argsort(b[:, axis], kind="stable")
+    xb = b[order, axis]
+    if same:
+        # Sorted row k pairs only with the rows after it
+        a_rows = order
+        lo = np.arange(1, len(b) + 1)
+        hi = np.searchsorted(xb, xb + reach, "left")
+    else:
+        a_rows = np.arange(len(a))
+        xa = a[:, axis]
+        lo = np.searchsorted(xb, xa - reach, "right")
+        hi = np.searchsorted(xb, xa + reach, "left")
+    counts = np.maximum(hi - lo, 0)
+    ends = np.cumsum(counts)
+    reach_sq = reach * reach
+    
+    start, n = 0, len(counts)
+    while start < n:
+        base = ends[start] - counts[start]
+        stop = max(start + 1, int(np.searchsorted(ends, base + block, "right")))
+        c = counts[start:stop]
+        total = int(ends[stop - 1] - base)
+        if total:
+            k = np.repeat(np.arange(start, stop), c)
+            j = np.arange(total) - np.repeat(ends[start:stop] - c - base, c) + lo[k]
+            ia, jb = a_rows[k], order[j]
+            d = a[ia] - b[jb]
+            hit = np.einsum("ij,ij->i", d, d) < reach_sq
+            if hit.any():
+                yield ia[hit], jb[hit]
+        start = stop
+
+def _resolve_collisions_arr(ids: List[str], pos, vel, radius: float, alerts: list):
+    """
+    _resolve_collisions over SoA arrays (in place).
+    A broadphase check skips the pairwise pass when nothing overlaps (the
+    common case); otherwise pairs are resolved sequentially in sorted-id
+    order, exactly like the dict kernel.
+    """
+    n = len(ids)
+    if n < 2:
+        return
+    
+    min_dist = radius + radius
+    min_dist_sq = min_dist * min_dist
+    if next(broadphase_pairs(pos, min_dist), None) is None:
+        return
+    
+    order = sorted(range(n), key=ids.__getitem__)
+    p = pos.tolist()
+    v = vel.tolist()
+    
+    for i in range(n):
+        a = order[i]
+        for j in range(i + 1, n):
+            b = order[j]
+            pa, pb = p[a], p[b]
+            
+            dx = pb[0] - pa[0]
+            dy = pb[1] - pa[1]
+            dz = pb[2] - pa[2]
+            d_sq = dx*dx + dy*dy + dz*dz
+            
+            if d_sq < min_dist_sq:
+                dist = math.sqrt(d_sq) if d_sq > 0 else 0.001
+                push = (min_dist - dist) * 0.5 / dist
+                
+                # Move both entities apart
+                p[a] = [pa[0] - dx * push, pa[1] - dy * push, pa[2] - dz * push]
+                p[b] = [pb[0] + dx * push, pb[1] + dy * push, pb[2] + dz * push]
+                
+                # Damp velocity
+                v[a] = [c * 0.5 for c in v[a]]
+                v[b] = [c * 0.5 for c in v[b]]
+                
+                alerts.append(SpatialAlert(
+                    "INFO", "COLLISION_RESOLVED",
+                    f"Resolved collision {ids[a]} ↔ {ids[b]}",
+                    (ids[a], ids[b])
+                ))
+    
+    pos[:] = p
+    vel[:] = v
+
+def _enforce_bounds_arr(pos, vel, radius: float, bounds_min: Vec3, bounds_max: Vec3):
+    """Vectorized _enforce_bounds over SoA arrays (in place)."""
+    lo = np.asarray(bounds_min, dtype=pos.dtype) + radius
+    hi = np.asarray(bounds_max, dtype=pos.dtype) - radius
+    
+    out = (pos < lo) | (pos > hi)
+    if out.any():
+        np.clip(pos, lo, hi, out=pos)
+        vel[out] = 0.0
+
 def _enforce_bounds(world: SpatialWorld, alerts: list):
     """Keep entities within world bounds."""
     xmin, ymin, zmin = world.bounds_min
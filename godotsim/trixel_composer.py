@@ -6,14 +6,33 @@ Integrates with ZON memory system
 Outputs Godot-ready assets
 """
 
+import io
 import os
+import re
 import json
 import time
+import zlib
+import shutil
 import hashlib
+import functools
+import contextlib
+import concurrent.futures
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from PIL import Image, ImageDraw, ImageFont
-import random
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Upscale for the optional {id}_preview.png written next to each sprite
+PREVIEW_SCALE = 4
+
+# Distinct (prompt, palette, size) sprites each composer's _cached_sprite keeps
+SPRITE_CACHE_SIZE = 512
 
 @dataclass
 class TrixelStyle:
@@ -70,8 +89,24 @@ class TrixelComposer:
     - get_palette() - Get color palette for style
     """
     
-    def __init__(self, output_dir: str = "./trixel_output"):
+    # Prompt keyword -> (priority, pattern method, takes rng); earlier groups win
+    _KEYWORD_DISPATCH = {
+        word: (rank, method, seeded)
+        for rank, (method, seeded, words) in enumerate([
+            ("_generate_wall_pattern", True, ("wall", "brick", "stone")),
+            ("_generate_fire_pattern", True, ("fire", "flame", "torch")),
+            ("_generate_water_pattern", True, ("water", "ocean", "wave")),
+            ("_generate_tree_pattern", False, ("tree", "forest", "plant")),
+            ("_generate_character_pattern", False, ("character", "person", "npc")),
+        ])
+        for word in words
+    }
+    _KEYWORD_RE = re.compile("(?=(%s))" % "|".join(map(re.escape, _KEYWORD_DISPATCH)))
+    
+    def __init__(self, output_dir: str = "./trixel_output", png_compress_level: int = 1):
         self.output_dir = output_dir
+        # zlib level for sprite PNGs - 1 favours speed, raise it for release assets
+        self.png_compress_level = png_compress_level
         os.makedirs(output_dir, exist_ok=True)
         
         # Built-in palettes
@@ -113,6 +148,20 @@ class TrixelComposer:
             ]
         }
         
+        # Palettes are fixed after init - build their arrays and hashes once
+        self._palette_arrays = {name: np.asarray(p, dtype=np.uint8) for name, p in self.palettes.items()}
+        self._palette_hashes = {name: hashlib.blake2b(str(p).encode(), digest_size=4).hexdigest() for name, p in self.palettes.items()}
+        
+        # (asset id minus timestamp, size, scale) -> (first PNG written for it, its write job)
+        self._png_cache: Dict[Tuple[str, int, int], Tuple[str, concurrent.futures.Future]] = {}
+        
+        # Per-instance sprite memo, so the cache never outlives its composer
+        self._cached_sprite = functools.lru_cache(maxsize=SPRITE_CACHE_SIZE)(self._build_sprite)
+        
+        # PNG encoding and file writes overlap with generating the next sprite
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self._pending: List[concurrent.futures.Future] = []
+        
         print(f"Trixel Composer initialized")
         print(f"Output directory: {output_dir}")
         print(f"Available palettes: {list(self.palettes.keys())}")
@@ -121,7 +170,9 @@ class TrixelComposer:
                        prompt: str,
                        style: str = "fantasy",
                        size: int = 16,
-                       tags: List[str] = None) -> TrixelAsset:
+                       tags: List[str] = None,
+                       scale: int = 1,
+                       preview: bool = False) -> TrixelAsset:
         """
         Generate pixel art sprite from text prompt
         
@@ -130,6 +181,8 @@ class TrixelComposer:
             style: Palette name
             size: Sprite dimensions (size x size)
             tags: Metadata tags
+            scale: Integer upscale for the saved PNG (Godot can scale with Filter=Nearest)
+            preview: Also write a {id}_preview.png at PREVIEW_SCALE
             
         Returns:
             TrixelAsset with filepath and metadata
@@ -143,60 +196,103 @@ class TrixelComposer:
         print(f"   Size: {size}x{size}")
         
         # Get palette
-        palette = self.palettes.get(style, self.palettes["fantasy"])
+        palette_name = style if style in self.palettes else "fantasy"
+        palette = self._palette_arrays[palette_name]
         
         # Generate sprite data (procedural for now, can integrate SD later)
         sprite_data = self._generate_procedural_sprite(prompt, palette, size)
         
-        # Create PIL Image
-        img = Image.new('RGB', (size, size))
-        pixels = img.load()
-        
-        for y in range(size):
-            for x in range(size):
-                pixels[x, y] = sprite_data[y][x]
-        
         # Save file
         asset_id = self._generate_asset_id(prompt, style)
         filename = f"{asset_id}.png"
         filepath = os.path.join(self.output_dir, filename)
-        
-        # Scale up for visibility (4x)
-        display_img = img.resize((size * 4, size * 4), Image.NEAREST)
-        display_img.save(filepath)
-        
-        print(f"   ✓ Saved to: {filepath}")
+        zon_path = filepath.replace('.png', '.zon')
         
         # Create asset metadata
-        palette_hash = hashlib.md5(str(palette).encode()).hexdigest()[:8]
+        palette_hash = self._palette_hashes[palette_name]
         
         asset = TrixelAsset(
             id=asset_id,
             prompt=prompt,
             style_name=style,
             filepath=filepath,
-            width=size * 4,  # Scaled size
-            height=size * 4,
+            width=size * scale,
+            height=size * scale,
             created_at=time.time(),
             palette_hash=palette_hash,
             tags=tags + [style, "sprite"]
         )
         
-        # Save ZON metadata
-        zon_path = filepath.replace('.png', '.zon')
-        with open(zon_path, 'w') as f:
-            f.write(asset.to_zon())
-        
+        preview_img = None
+        if preview:
+            preview_img = Image.fromarray(self._upscale(sprite_data, PREVIEW_SCALE), 'RGB')
+        
+        # PNG + ZON writes happen on the I/O pool; call flush() before
+        # reading the files back
+        png_key = (asset_id.rsplit('_', 1)[0], size, scale)
+        cached = self._png_cache.get(png_key)
+        if cached and cached[1].done() and cached[1].exception() is None and os.path.exists(cached[0]):
+            # Sprites are deterministic per prompt, so a repeat just copies the PNG
+            # (once the first write has landed - never wait on it here)
+            job = self._io_pool.submit(self._write_outputs, filepath, zon_path, asset.to_zon(),
+                                       source=cached[0], preview=preview_img)
+        else:
+            image = Image.fromarray(self._upscale(sprite_data, scale), 'RGB')
+            job = self._io_pool.submit(self._write_outputs, filepath, zon_path, asset.to_zon(),
+                                       image=image, preview=preview_img)
+            self._png_cache[png_key] = (filepath, job)
+        job.add_done_callback(self._report_io_error)
+        self._pending = [j for j in self._pending if not j.done()]
+        self._pending.append(job)
+        
+        print(f"   ✓ Queued: {filepath}")
         print(f"   ✓ Metadata: {zon_path}")
         
         return asset
         
+    @staticmethod
+    def _upscale(grid: np.ndarray, factor: int) -> np.ndarray:
+        """Integer nearest-neighbour upscale - a broadcast view plus one contiguous copy"""
+        if factor == 1:
+            return grid
+        h, w, _ = grid.shape
+        return np.broadcast_to(grid[:, None, :, None, :],
+                               (h, factor, w, factor, 3)).reshape(h * factor, w * factor, 3)
+        
+    def _save_png(self, image: Image.Image, path: str):
+        image.save(path, format='PNG', optimize=False, compress_level=self.png_compress_level)
+        
+    def _write_outputs(self, filepath: str, zon_path: str, zon: str,
+                       image: Optional[Image.Image] = None, source: Optional[str] = None,
+                       preview: Optional[Image.Image] = None):
+        """Write a sprite's PNG (encoded from image, or copied from source), preview and ZON"""
+        if image is not None:
+            self._save_png(image, filepath)
+        elif source != filepath:
+            shutil.copyfile(source, filepath)
+        if preview is not None:
+            self._save_png(preview, filepath.replace('.png', '_preview.png'))
+        with open(zon_path, 'w') as f:
+            f.write(zon)
+            
+    @staticmethod
+    def _report_io_error(job: concurrent.futures.Future):
+        if job.exception() is not None:
+            print(f"   ✗ Write failed: {job.exception()}")
+            
+    def flush(self):
+        """Block until every queued PNG/ZON write has finished"""
+        pending, self._pending = self._pending, []
+        for job in pending:
+            job.result()
+        
     def _generate_procedural_sprite(self, 
                                    prompt: str,
-                                   palette: List[Tuple[int, int, int]],
-                                   size: int) -> List[List[Tuple[int, int, int]]]:
+                                   palette: np.ndarray,
+                                   size: int) -> np.ndarray:
         """
         Generate procedural pixel art based on prompt keywords
+        Returns a read-only (size, size, 3) uint8 RGB array
         
         This is a placeholder for real AI generation.
         You can replace this with:
@@ -205,172 +301,155 @@ class TrixelComposer:
         - DALL-E API
         - Custom trained pixel art model
         """
-        
-        # Parse prompt for keywords
-        prompt_lower = prompt.lower()
-        
-        # Initialize grid
-        grid = [[palette[0] for _ in range(size)] for _ in range(size)]
-        
-        # Procedural generation based on keywords
-        if any(word in prompt_lower for word in ["wall", "brick", "stone"]):
-            grid = self._generate_wall_pattern(palette, size)
-            
-        elif any(word in prompt_lower for word in ["fire", "flame", "torch"]):
-            grid = self._generate_fire_pattern(palette, size)
-            
-        elif any(word in prompt_lower for word in ["water", "ocean", "wave"]):
-            grid = self._generate_water_pattern(palette, size)
-            
-        elif any(word in prompt_lower for word in ["tree", "forest", "plant"]):
-            grid = self._generate_tree_pattern(palette, size)
-            
-        elif any(word in prompt_lower for word in ["character", "person", "npc"]):
-            grid = self._generate_character_pattern(palette, size)
-            
+        palette_key = np.asarray(palette, dtype=np.uint8).tobytes()
+        return self._cached_sprite(prompt, palette_key, size)
+        
+    def _build_sprite(self, prompt: str, palette_key: bytes, size: int) -> np.ndarray:
+        """Body of _generate_procedural_sprite, memoized per instance as _cached_sprite"""
+        palette = np.frombuffer(palette_key, dtype=np.uint8).reshape(-1, 3)
+        
+        # Seed from the prompt so the same request always draws the same sprite
+        rng = np.random.default_rng(zlib.crc32(f"{prompt}|{size}".encode()))
+        
+        # Parse prompt for keywords - one scan finds every (overlapping) hit
+        hits = [self._KEYWORD_DISPATCH[m.group(1)]
+                for m in self._KEYWORD_RE.finditer(prompt.lower())]
+        
+        # Procedural generation based on keywords; default is the dithered pattern
+        if not hits:
+            return self._freeze(self._generate_abstract_pattern(palette, size))
+        _, method, seeded = min(hits)
+        if seeded:
+            grid = getattr(self, method)(palette, size, rng)
         else:
-            # Default: random dithered pattern
-            grid = self._generate_abstract_pattern(palette, size)
+            grid = getattr(self, method)(palette, size)
             
+        return self._freeze(grid)
+        
+    @staticmethod
+    def _freeze(grid: np.ndarray) -> np.ndarray:
+        """Mark a cached grid read-only so callers can't mutate the memo"""
+        grid.setflags(write=False)
         return grid
         
-    def _generate_wall_pattern(self, palette, size):
+    @staticmethod
+    def _blank_grid(palette: np.ndarray, size: int, idx: int = 0) -> np.ndarray:
+        """size x size uint8 RGB grid filled with palette[idx]"""
+        return np.broadcast_to(palette[idx], (size, size, 3)).copy()
+        
+    def _generate_wall_pattern(self, palette: np.ndarray, size: int,
+                               rng: np.random.Generator) -> np.ndarray:
         """Generate brick/stone wall pattern"""
-        grid = [[palette[0] for _ in range(size)] for _ in range(size)]
+        grid = self._blank_grid(palette, size)
         
         # Draw bricks
         brick_height = size // 4
         brick_width = size // 3
         
+        # Vary color slightly - one palette index per pixel, drawn up front
+        base_idx = 2 + (rng.random((size, size)) < 0.5).astype(np.uint8)
+        if HAS_NUMBA:
+            return _wall_kernel(palette, base_idx, brick_height, brick_width)
+        
         for y in range(0, size, brick_height):
             offset = (y // brick_height) % 2
             for x in range(0, size, brick_width):
                 x_pos = x + (brick_width // 2 if offset else 0)
                 if x_pos < size:
                     # Fill brick
-                    for by in range(min(brick_height - 1, size - y)):
-                        for bx in range(min(brick_width - 1, size - x_pos)):
-                            if y + by < size and x_pos + bx < size:
-                                # Vary color slightly
-                                color_idx = 2 + random.randint(0, 1)
-                                grid[y + by][x_pos + bx] = palette[color_idx]
+                    rows = slice(y, y + brick_height - 1)
+                    cols = slice(x_pos, x_pos + brick_width - 1)
+                    grid[rows, cols] = palette[base_idx[rows, cols]]
                     
                     # Mortar lines (dark)
-                    for bx in range(min(brick_width, size - x_pos)):
-                        if x_pos + bx < size and y < size:
-                            grid[y][x_pos + bx] = palette[1]
+                    grid[y, x_pos:x_pos + brick_width] = palette[1]
                             
         return grid
         
-    def _generate_fire_pattern(self, palette, size):
+    def _generate_fire_pattern(self, palette: np.ndarray, size: int,
+                               rng: np.random.Generator) -> np.ndarray:
         """Generate animated fire effect"""
-        grid = [[palette[0] for _ in range(size)] for _ in range(size)]
-        
-        # Fire starts at bottom
-        for y in range(size // 2, size):
-            for x in range(size):
-                # Probability decreases as we go up
-                heat = (y - size // 2) / (size // 2)
-                if random.random() < heat:
-                    # Hot colors at bottom
-                    if y > size * 0.75:
-                        grid[y][x] = palette[4]  # Bright
-                    elif y > size * 0.6:
-                        grid[y][x] = palette[3]  # Mid
-                    else:
-                        grid[y][x] = palette[2]  # Dark
+        grid = self._blank_grid(palette, size)
+        half = size // 2
+        
+        # Fire starts at bottom; probability decreases as we go up
+        rows = np.arange(half, size)
+        heat = (rows - half) / half
+        lit = rng.random((len(rows), size)) < heat[:, None]
+        
+        # Hot colors at bottom
+        shade = np.where(rows > size * 0.75, 4, np.where(rows > size * 0.6, 3, 2))
+        lower = grid[half:]
+        lower[lit] = palette[np.broadcast_to(shade[:, None], lit.shape)[lit]]
                         
         return grid
         
-    def _generate_water_pattern(self, palette, size):
+    def _generate_water_pattern(self, palette: np.ndarray, size: int,
+                                rng: np.random.Generator) -> np.ndarray:
         """Generate water wave pattern"""
-        grid = [[palette[1] for _ in range(size)] for _ in range(size)]
+        grid = self._blank_grid(palette, size, 1)
         
         # Horizontal wave lines
-        for y in range(0, size, 3):
-            wave_offset = random.randint(-1, 1)
-            for x in range(size):
-                if (x + wave_offset) % 4 < 2:
-                    grid[y][x] = palette[2]
-                else:
-                    grid[y][x] = palette[3]
+        rows = np.arange(0, size, 3)
+        wave_offset = rng.integers(-1, 2, size=len(rows))
+        crest = (np.arange(size)[None, :] + wave_offset[:, None]) % 4 < 2
+        grid[rows] = palette[np.where(crest, 2, 3)]
                     
         # Add foam highlights
-        for _ in range(size // 4):
-            x = random.randint(0, size - 1)
-            y = random.randint(0, size - 1)
-            grid[y][x] = palette[4]
+        foam_y, foam_x = rng.integers(0, size, (2, size // 4))
+        grid[foam_y, foam_x] = palette[4]
             
         return grid
         
-    def _generate_tree_pattern(self, palette, size):
+    def _generate_tree_pattern(self, palette: np.ndarray, size: int) -> np.ndarray:
         """Generate simple tree sprite"""
-        grid = [[palette[0] for _ in range(size)] for _ in range(size)]
+        grid = self._blank_grid(palette, size)
         
         # Trunk
         trunk_x = size // 2
         trunk_width = max(2, size // 6)
-        for y in range(size // 2, size):
-            for x in range(trunk_x - trunk_width // 2, trunk_x + trunk_width // 2):
-                if 0 <= x < size:
-                    grid[y][x] = palette[2]
+        grid[size // 2:, trunk_x - trunk_width // 2:trunk_x + trunk_width // 2] = palette[2]
         
         # Foliage (circular-ish)
         center_y = size // 3
         center_x = size // 2
         radius = size // 3
         
-        for y in range(max(0, center_y - radius), min(size, center_y + radius)):
-            for x in range(max(0, center_x - radius), min(size, center_x + radius)):
-                dist = ((x - center_x) ** 2 + (y - center_y) ** 2) ** 0.5
-                if dist < radius:
-                    grid[y][x] = palette[3]
+        yy, xx = np.ogrid[:size, :size]
+        grid[(xx - center_x) ** 2 + (yy - center_y) ** 2 < radius * radius] = palette[3]
                     
         return grid
         
-    def _generate_character_pattern(self, palette, size):
+    def _generate_character_pattern(self, palette: np.ndarray, size: int) -> np.ndarray:
         """Generate simple character sprite"""
-        grid = [[palette[0] for _ in range(size)] for _ in range(size)]
+        grid = self._blank_grid(palette, size)
         
         center_x = size // 2
         
         # Head
         head_y = size // 4
         head_size = max(2, size // 4)
-        for y in range(head_y - head_size, head_y + head_size):
-            for x in range(center_x - head_size, center_x + head_size):
-                if 0 <= y < size and 0 <= x < size:
-                    grid[y][x] = palette[3]
+        grid[max(0, head_y - head_size):head_y + head_size,
+             max(0, center_x - head_size):center_x + head_size] = palette[3]
         
         # Body
-        for y in range(size // 3, size * 2 // 3):
-            for x in range(center_x - 1, center_x + 2):
-                if 0 <= x < size and 0 <= y < size:
-                    grid[y][x] = palette[2]
+        grid[size // 3:size * 2 // 3, center_x - 1:center_x + 2] = palette[2]
         
         # Legs
-        for y in range(size * 2 // 3, size):
-            grid[y][center_x - 1] = palette[1]
-            grid[y][center_x + 1] = palette[1]
+        grid[size * 2 // 3:, [center_x - 1, center_x + 1]] = palette[1]
             
         return grid
         
-    def _generate_abstract_pattern(self, palette, size):
+    def _generate_abstract_pattern(self, palette: np.ndarray, size: int) -> np.ndarray:
         """Generate abstract dithered pattern"""
-        grid = [[palette[0] for _ in range(size)] for _ in range(size)]
-        
-        for y in range(size):
-            for x in range(size):
-                # Perlin-like noise (simplified)
-                val = (x * 7 + y * 13) % len(palette)
-                grid[y][x] = palette[val]
-                
-        return grid
+        # Perlin-like noise (simplified)
+        idx = (np.arange(size)[None, :] * 7 + np.arange(size)[:, None] * 13) % len(palette)
+        return palette[idx]
         
     def _generate_asset_id(self, prompt: str, style: str) -> str:
         """Generate unique asset ID"""
         timestamp = int(time.time() * 1000)
-        prompt_hash = hashlib.md5(prompt.encode()).hexdigest()[:8]
+        prompt_hash = hashlib.blake2b(prompt.encode(), digest_size=4).hexdigest()
         return f"trixel_{style}_{prompt_hash}_{timestamp}"
         
     def get_palette(self, style: str) -> List[Tuple[int, int, int]]:
@@ -382,6 +461,55 @@ class TrixelComposer:
         return list(self.palettes.keys())
 
 
+if HAS_NUMBA:
+    @njit(nogil=True, cache=True)
+    def _wall_kernel(palette, base_idx, brick_height, brick_width):
+        """Per-pixel form of the brick loop in _generate_wall_pattern."""
+        size = base_idx.shape[0]
+        grid = np.empty((size, size, 3), dtype=np.uint8)
+        for y in range(size):
+            by = y % brick_height
+            offset = brick_width // 2 if (y // brick_height) % 2 else 0
+            for x in range(size):
+                rel = x - offset
+                if rel < 0:
+                    c = 0
+                elif by == 0:
+                    c = 1  # Mortar line
+                elif by < brick_height - 1 and rel % brick_width < brick_width - 1:
+                    c = base_idx[y, x]
+                else:
+                    c = 0
+                grid[y, x, 0] = palette[c, 0]
+                grid[y, x, 1] = palette[c, 1]
+                grid[y, x, 2] = palette[c, 2]
+        return grid
+    
+    # Compile (or load from cache) for the read-only palettes that
+    # _cached_sprite passes in.
+    _warm_palette = np.zeros((5, 3), dtype=np.uint8)
+    _warm_palette.setflags(write=False)
+    _wall_kernel(_warm_palette, np.full((4, 4), 2, dtype=np.uint8), 1, 1)
+    del _warm_palette
+
+
+# Batch generation - one composer per worker process, built by the initializer
+_worker_composer: Optional[TrixelComposer] = None
+
+
+def _init_worker(output_dir: str):
+    global _worker_composer
+    with contextlib.redirect_stdout(io.StringIO()):
+        _worker_composer = TrixelComposer(output_dir)
+
+
+def _generate_in_worker(job: Dict) -> TrixelAsset:
+    """generate_sprite(**job), waiting for its files before the result goes back"""
+    asset = _worker_composer.generate_sprite(**job)
+    _worker_composer.flush()
+    return asset
+
+
 # Example usage and test
 if __name__ == "__main__":
     composer = TrixelComposer()
@@ -390,48 +518,28 @@ if __name__ == "__main__":
     print("🎨 TRIXEL COMPOSER - TEST SUITE")
     print("="*60)
     
-    # Test 1: Wall tile
-    print("\nTest 1: Stone wall tile")
-    wall = composer.generate_sprite(
-        "stone wall brick tile",
-        style="fantasy",
-        size=16,
-        tags=["tile", "wall"]
-    )
-    
-    # Test 2: Fire sprite
-    print("\nTest 2: Fire elemental")
-    fire = composer.generate_sprite(
-        "fire flame torch",
-        style="fantasy",
-        size=16,
-        tags=["effect", "fire"]
-    )
-    
-    # Test 3: Water
-    print("\nTest 3: Ocean water")
-    water = composer.generate_sprite(
-        "ocean water wave",
-        style="ocean",
-        size=16,
-        tags=["tile", "water"]
-    )
-    
-    # Test 4: Character
-    print("\nTest 4: NPC character")
-    character = composer.generate_sprite(
-        "character person npc",
-        style="scifi",
-        size=16,
-        tags=["character", "npc"]
-    )
+    # Independent sprites - generate them in parallel
+    jobs = [
+        # Test 1: Wall tile
+        dict(prompt="stone wall brick tile", style="fantasy", size=16, preview=True, tags=["tile", "wall"]),
+        # Test 2: Fire sprite
+        dict(prompt="fire flame torch", style="fantasy", size=16, preview=True, tags=["effect", "fire"]),
+        # Test 3: Water
+        dict(prompt="ocean water wave", style="ocean", size=16, preview=True, tags=["tile", "water"]),
+        # Test 4: Character
+        dict(prompt="character person npc", style="scifi", size=16, preview=True, tags=["character", "npc"]),
+    ]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1),
+                                                initializer=_init_worker,
+                                                initargs=(composer.output_dir,)) as pool:
+        assets = list(pool.map(_generate_in_worker, jobs))
     
     print("\n" + "="*60)
     print("✅ TEST COMPLETE")
     print("="*60)
-    print(f"\nGenerated {4} sprites in: {composer.output_dir}")
+    print(f"\nGenerated {len(assets)} sprites in: {composer.output_dir}")
     print("\nCheck the output directory for:")
-    print("  - PNG files (scaled 4x for visibility)")
+    print("  - PNG files (native size) + _preview.png (scaled 4x for visibility)")
     print("  - ZON metadata files")
     print("\n💡 To use in Godot:")
     print("  1. Copy PNG files to res://assets/sprites/")
@@ -16,9 +16,15 @@ sys.path.insert(0, project_root)
 
 # Now imports will work
 from core.zw_core import parse_zw
-from gui.official_zw_validator import ZWValidator, ZWValidationError
+from gui.official_zw_validator import ZWValidationError, get_validator
 import json
 
+# Large parse dumps go into the output pane in pieces this size
+OUTPUT_CHUNK_CHARS = 64 * 1024
+
+# Shared look for every text pane
+DARK_STYLE = dict(wrap=tk.WORD, font=('Courier', 9), bg='#1e1e1e', fg='#d4d4d4')
+
 
 class ZWEditorGUI:
     def __init__(self, root):
@@ -28,6 +34,10 @@ class ZWEditorGUI:
         
         self.current_file = None
         self.zw_content = ""
+        # (editor text, parse result) - dropped whenever the editor changes
+        self._cached_parse = None
+        # validate() clears errors/warnings itself, so one instance serves every click
+        self._validator = get_validator(strict=False)
         
         self._create_menu()
         self._create_ui()
@@ -59,14 +69,12 @@ class ZWEditorGUI:
         toolbar = tk.Frame(self.root, bg='#2b2b2b', height=50)
         toolbar.pack(side=tk.TOP, fill=tk.X)
         
-        tk.Button(toolbar, text="📂 Open", command=self.open_file, 
-                 bg='#3c3f41', fg='white', padx=10).pack(side=tk.LEFT, padx=5, pady=5)
-        tk.Button(toolbar, text="💾 Save", command=self.save_file,
-                 bg='#3c3f41', fg='white', padx=10).pack(side=tk.LEFT, padx=5, pady=5)
-        tk.Button(toolbar, text="🔍 Parse", command=self.parse_content,
-                 bg='#3c3f41', fg='white', padx=10).pack(side=tk.LEFT, padx=5, pady=5)
-        tk.Button(toolbar, text="✓ Validate", command=self.validate_content,
-                 bg='#3c3f41', fg='white', padx=10).pack(side=tk.LEFT, padx=5, pady=5)
+        for text, command in [("📂 Open", self.open_file),
+                              ("💾 Save", self.save_file),
+                              ("🔍 Parse", self.parse_content),
+                              ("✓ Validate", self.validate_content)]:
+            tk.Button(toolbar, text=text, command=command,
+                     bg='#3c3f41', fg='white', padx=10).pack(side=tk.LEFT, padx=5, pady=5)
         
         # File path label
         self.file_label = tk.Label(toolbar, text="No file loaded", 
@@ -84,14 +92,11 @@ class ZWEditorGUI:
         tk.Label(left_frame, text="ZW Content", font=('Arial', 12, 'bold')).pack(pady=5)
         
         self.zw_editor = scrolledtext.ScrolledText(
-            left_frame, 
-            wrap=tk.WORD, 
-            font=('Courier', 10),
-            bg='#1e1e1e',
-            fg='#d4d4d4',
-            insertbackground='white'
+            left_frame,
+            **dict(DARK_STYLE, font=('Courier', 10), insertbackground='white')
         )
         self.zw_editor.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.zw_editor.bind('<<Modified>>', self._on_editor_modified)
         
         # Right panel - Output/Results
         right_frame = tk.Frame(paned)
@@ -105,26 +110,14 @@ class ZWEditorGUI:
         parse_frame = tk.Frame(notebook)
         notebook.add(parse_frame, text="Parsed")
         
-        self.parse_output = scrolledtext.ScrolledText(
-            parse_frame,
-            wrap=tk.WORD,
-            font=('Courier', 9),
-            bg='#1e1e1e',
-            fg='#d4d4d4'
-        )
+        self.parse_output = scrolledtext.ScrolledText(parse_frame, **DARK_STYLE)
         self.parse_output.pack(fill=tk.BOTH, expand=True)
         
         # Validation output tab
         valid_frame = tk.Frame(notebook)
         notebook.add(valid_frame, text="Validation")
         
-        self.valid_output = scrolledtext.ScrolledText(
-            valid_frame,
-            wrap=tk.WORD,
-            font=('Courier', 9),
-            bg='#1e1e1e',
-            fg='#d4d4d4'
-        )
+        self.valid_output = scrolledtext.ScrolledText(valid_frame, **DARK_STYLE)
         self.valid_output.pack(fill=tk.BOTH, expand=True)
         
         # Status bar
@@ -179,22 +172,35 @@ class ZWEditorGUI:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save file:\n{e}")
     
+    def _on_editor_modified(self, event=None):
+        """Drop the cached parse; re-arm the one-shot <<Modified>> flag"""
+        self._cached_parse = None
+        self.zw_editor.edit_modified(False)
+    
+    def _get_parsed(self):
+        """(content, parsed) for the editor text, parsed at most once per edit"""
+        if self._cached_parse is None:
+            content = self.zw_editor.get(1.0, tk.END).strip()
+            self._cached_parse = (content, parse_zw(content) if content else None)
+        return self._cached_parse
+    
     def parse_content(self):
         """Parse ZW content and display result"""
-        content = self.zw_editor.get(1.0, tk.END).strip()
-        
-        if not content:
-            self.parse_output.delete(1.0, tk.END)
-            self.parse_output.insert(1.0, "No content to parse")
-            return
-        
         try:
-            parsed = parse_zw(content)
+            content, parsed = self._get_parsed()
+            
+            if not content:
+                self.parse_output.delete(1.0, tk.END)
+                self.parse_output.insert(1.0, "No content to parse")
+                return
+            
             formatted = json.dumps(parsed, indent=2)
             
             self.parse_output.delete(1.0, tk.END)
             self.parse_output.insert(1.0, "✅ Parse successful!\n\n")
-            self.parse_output.insert(tk.END, formatted)
+            for start in range(0, len(formatted), OUTPUT_CHUNK_CHARS):
+                self.parse_output.insert(tk.END, formatted[start:start + OUTPUT_CHUNK_CHARS])
+                self.root.update_idletasks()
             
             self.status_bar.config(text="Parse successful")
             
@@ -205,19 +211,17 @@ class ZWEditorGUI:
     
     def validate_content(self):
         """Validate ZW content"""
-        content = self.zw_editor.get(1.0, tk.END).strip()
-        
-        if not content:
-            self.valid_output.delete(1.0, tk.END)
-            self.valid_output.insert(1.0, "No content to validate")
-            return
-        
         try:
-            # Parse first
-            parsed = parse_zw(content)
+            # Parse first (reuses the Parse button's result if unedited)
+            content, parsed = self._get_parsed()
+            
+            if not content:
+                self.valid_output.delete(1.0, tk.END)
+                self.valid_output.insert(1.0, "No content to validate")
+                return
             
             # Validate
-            validator = ZWValidator(strict=False)
+            validator = self._validator
             is_valid = validator.validate(parsed)
             
             # Display results
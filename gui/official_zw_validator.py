@@ -2,21 +2,60 @@
 ZW Validator - Enforces ZW_SPEC.md rules
 """
 
+import functools
+from pathlib import Path
+
+# Optional C JSON decoder for .json inputs (stdlib json fallback)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Stack marker for list items / the root, which have no key to check
+_NO_KEY = object()
+
+# Characters that may not appear in a bareword key
+_BAD_KEY_CHARS = frozenset(' \t\n{}[]"')
+
+# Required fields per type (§6.2), in the order missing ones are reported
+_OBJECT_FIELDS = ('type', 'id', 'description')
+_CONTAINER_FIELDS = ('type', 'id', 'contents')
+_SCENE_FIELDS = ('id', 'description')
+
+
+@functools.lru_cache(maxsize=4096)
+def _valid_bareword(key):
+    """Cached key check - the same few keys recur all over a ZW tree"""
+    return isinstance(key, str) and bool(key) and _BAD_KEY_CHARS.isdisjoint(key)
+
+
 class ZWValidationError(Exception):
     """Raised when ZW content violates specification"""
     pass
 
+class _EarlyExit(Exception):
+    """Internal - stops a fail_fast walk at the first error"""
+
 class ZWValidator:
     """
     Validates ZW structures against the specification.
     Based on ZW_SPEC.md v0.1
     """
     
-    def __init__(self, strict=False, max_depth=20):
+    def __init__(self, strict=False, max_depth=20, fail_fast=None):
         self.strict = strict
         self.max_depth = max_depth
+        # Stop at the first error instead of collecting a full report;
+        # strict mode only ever reports "failed", so it defaults on there
+        self.fail_fast = strict if fail_fast is None else fail_fast
         self.errors = []
         self.warnings = []
+        self._type_dispatch = {
+            'object': self._validate_object,
+            'container': self._validate_container,
+            'scene': self._validate_scene,
+        }
     
     def validate(self, parsed_zw, zw_type=None):
         """
@@ -31,16 +70,21 @@ class ZWValidator:
         
         Raises:
             ZWValidationError: If strict=True and validation fails
-        """
-        self.errors = []
-        self.warnings = []
         
-        # Structure validation
-        self._validate_structure(parsed_zw, depth=0)
+        With fail_fast, errors holds only the first problem found.
+        """
+        self.errors.clear()
+        self.warnings.clear()
         
-        # Type-specific validation
-        if zw_type:
-            self._validate_type(parsed_zw, zw_type)
+        try:
+            # Structure validation
+            self._validate_structure(parsed_zw, depth=0)
+            
+            # Type-specific validation
+            if zw_type:
+                self._validate_type(parsed_zw, zw_type)
+        except _EarlyExit:
+            pass
         
         # Check for errors
         if self.errors:
@@ -51,39 +95,45 @@ class ZWValidator:
         return True
     
     def _validate_structure(self, obj, depth=0):
-        """Recursively validate structure and depth"""
-        
-        # Depth check (§6.3)
-        if depth > self.max_depth:
-            self.errors.append(f"Max depth {self.max_depth} exceeded")
-            return
-        
-        if isinstance(obj, dict):
-            for key, value in obj.items():
-                # Validate key format
-                if not self._is_valid_key(key):
-                    self.errors.append(f"Invalid key format: '{key}'")
-                
-                # Recurse into value
-                self._validate_structure(value, depth + 1)
-        
-        elif isinstance(obj, list):
-            for item in obj:
-                self._validate_structure(item, depth + 1)
-    
-    def _is_valid_key(self, key):
         """
-        Check if key is valid bareword
-        - No whitespace
-        - No special characters {}[]"
+        Validate structure and depth - explicit stack, same visit (and error)
+        order as the old recursive walk: each key is checked just before its value
         """
-        if not isinstance(key, str):
-            return False
-        if not key:
-            return False
-        if any(c in key for c in ' \t\n{}[]"'):
-            return False
-        return True
+        errors = self.errors
+        max_depth = self.max_depth
+        valid_key = _valid_bareword
+        fail_fast = self.fail_fast
+        
+        # (key or _NO_KEY, node, depth); children pushed reversed so they pop in order
+        stack = [(_NO_KEY, obj, depth)]
+        while stack:
+            key, node, d = stack.pop()
+            
+            # Validate key format
+            if key is not _NO_KEY and not valid_key(key):
+                errors.append(f"Invalid key format: '{key}'")
+                if fail_fast:
+                    raise _EarlyExit
+            
+            # Depth check (§6.3)
+            if d > max_depth:
+                errors.append(f"Max depth {max_depth} exceeded")
+                if fail_fast:
+                    raise _EarlyExit
+                continue
+            
+            t = type(node)
+            if t is dict:
+                d1 = d + 1
+                stack.extend([(k, v, d1) for k, v in node.items()][::-1])
+            elif t is list:
+                d1 = d + 1
+                stack.extend([(_NO_KEY, v, d1) for v in reversed(node)])
+    
+    # Check if key is valid bareword
+    # - No whitespace
+    # - No special characters {}[]"
+    _is_valid_key = staticmethod(_valid_bareword)
     
     def _validate_type(self, obj, expected_type):
         """Validate type-specific requirements (§6.2)"""
@@ -92,21 +142,19 @@ class ZWValidator:
             self.errors.append(f"Expected dict for type '{expected_type}', got {type(obj)}")
             return
         
-        # Get the actual object data (might be wrapped in type key)
-        data = obj.get(expected_type, obj)
+        type_validator = self._type_dispatch.get(expected_type)
+        if type_validator is None:
+            return
         
-        if expected_type == 'object':
-            self._validate_object(data)
-        elif expected_type == 'container':
-            self._validate_container(data)
-        elif expected_type == 'scene':
-            self._validate_scene(data)
+        # Get the actual object data (might be wrapped in type key)
+        type_validator(obj.get(expected_type, obj))
+        # The type checks are a handful of lookups - just trim to the first
+        if self.fail_fast and len(self.errors) > 1:
+            del self.errors[1:]
     
     def _validate_object(self, obj):
         """Validate object type requirements"""
-        required = ['type', 'id', 'description']
-        
-        for field in required:
+        for field in _OBJECT_FIELDS:
             if field not in obj:
                 self.errors.append(f"Object missing required field: '{field}'")
         
@@ -116,9 +164,7 @@ class ZWValidator:
     
     def _validate_container(self, obj):
         """Validate container type requirements"""
-        required = ['type', 'id', 'contents']
-        
-        for field in required:
+        for field in _CONTAINER_FIELDS:
             if field not in obj:
                 self.errors.append(f"Container missing required field: '{field}'")
         
@@ -129,9 +175,7 @@ class ZWValidator:
     
     def _validate_scene(self, obj):
         """Validate scene type requirements"""
-        required = ['id', 'description']
-        
-        for field in required:
+        for field in _SCENE_FIELDS:
             if field not in obj:
                 self.errors.append(f"Scene missing required field: '{field}'")
     
@@ -155,6 +199,22 @@ class ZWValidator:
         return "\n".join(report)
 
 
+def get_validator(strict=False, max_depth=20, fail_fast=None):
+    """
+    Shared ZWValidator for a (strict, max_depth, fail_fast) config.
+    validate() resets it in place, so copy errors/warnings you want to keep;
+    not for concurrent use from several threads.
+    """
+    strict = bool(strict)
+    fail_fast = strict if fail_fast is None else bool(fail_fast)
+    return _shared_validator(strict, max_depth, fail_fast)
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_validator(strict, max_depth, fail_fast):
+    return ZWValidator(strict=strict, max_depth=max_depth, fail_fast=fail_fast)
+
+
 def validate_zw_file(filepath, zw_type=None, strict=False):
     """
     Convenience function to validate a ZW file
@@ -171,16 +231,19 @@ def validate_zw_file(filepath, zw_type=None, strict=False):
     import json
     
     # Read file
-    with open(filepath, 'r') as f:
-        content = f.read()
+    content = Path(filepath).read_text(encoding='utf-8')
     
     # Parse based on extension
     if filepath.endswith('.json'):
-        parsed = json.loads(content)
+        try:
+            parsed = orjson.loads(content) if HAS_ORJSON else json.loads(content)
+        except ValueError:
+            # orjson refuses NaN/Infinity and ints beyond 64 bits; json doesn't
+            parsed = json.loads(content)
     else:
         parsed = parse_zw(content)
     
-    # Validate
+    # Validate - a fresh validator per file, so the caller owns its results
     validator = ZWValidator(strict=strict)
     is_valid = validator.validate(parsed, zw_type)
     
@@ -12,6 +12,11 @@ import os
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, ttk
 import json
+import collections
+import threading
+import concurrent.futures
+from pathlib import Path
+from json.encoder import encode_basestring_ascii
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -20,7 +25,177 @@ sys.path.insert(0, project_root)
 # Core imports
 from core.zw_core import parse_zw
 from core.zon.zon_binary_pack import pack_to_zonb, unpack_from_zonb
-from gui.official_zw_validator import ZWValidator, ZWValidationError
+from gui.official_zw_validator import ZWValidationError, get_validator
+
+# Optional C JSON encoder for the parse / ZONB panes (stdlib json fallback)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Distinct editor buffers ZWEditorCore keeps parse / validation results for
+CORE_CACHE_SIZE = 16
+
+# Slice size for _count_tokens - bounds how many token strings exist at once
+TOKEN_CHUNK_CHARS = 1 << 16
+
+
+def _count_tokens(text):
+    """len(text.split()), splitting one whitespace-aligned slice at a time"""
+    count = 0
+    start = 0
+    n = len(text)
+    while start < n:
+        end = min(start + TOKEN_CHUNK_CHARS, n)
+        # Move the cut to the next whitespace so no token straddles two slices
+        while end < n and not text[end].isspace():
+            end += 1
+        count += len(text[start:end].split())
+        start = end
+    return count
+
+
+def _pretty_json(obj):
+    """Indented JSON text for display - non-ASCII is shown as-is, not escaped"""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits - stdlib json takes anything
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+# JSON spelling of the non-container scalars json.dumps handles specially
+_JSON_CONSTANTS = {True: 'true', False: 'false', None: 'null'}
+
+
+def _json_scalar(obj):
+    """The literal json.dumps writes for a scalar (or a dict key), ensure_ascii on"""
+    if isinstance(obj, str):
+        return encode_basestring_ascii(obj)
+    if obj is None or obj is True or obj is False:
+        return _JSON_CONSTANTS[obj]
+    if isinstance(obj, int):
+        return int.__repr__(obj)
+    if isinstance(obj, float):
+        if obj != obj:
+            return 'NaN'
+        if obj in (float('inf'), float('-inf')):
+            return 'Infinity' if obj > 0 else '-Infinity'
+        return float.__repr__(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def _measure_json(obj):
+    """
+    (chars, tokens) of json.dumps(obj, indent=2) - i.e. its len() and
+    len(.split()) - without building the string
+    """
+    chars = 0
+    tokens = 0
+    after_ws = True  # start of text acts like whitespace
+    
+    def literal(text):
+        # Escaped literals start and end non-blank; only ' ' can appear inside
+        nonlocal chars, tokens, after_ws
+        chars += len(text)
+        tokens += (len(text.split()) if ' ' in text else 1) - (not after_ws)
+        after_ws = False
+    
+    def walk(node, level):
+        nonlocal chars, tokens, after_ws
+        if isinstance(node, dict):
+            items = node.items()
+        elif isinstance(node, (list, tuple)):
+            items = None
+        else:
+            literal(_json_scalar(node))
+            return
+        
+        # Opening bracket - an empty container is just "{}" / "[]"
+        tokens += after_ws
+        after_ws = False
+        if not node:
+            chars += 2
+            return
+        chars += 1
+        
+        newline = 1 + 2 * (level + 1)
+        first = True
+        for item in (items if items is not None else node):
+            chars += newline if first else newline + 1  # ",\n" + indent
+            after_ws = True
+            first = False
+            if items is not None:
+                key, item = item
+                literal(_json_scalar(key) if isinstance(key, str) else
+                        encode_basestring_ascii(_json_scalar(key)))
+                chars += 2  # ": "
+                after_ws = True
+            walk(item, level + 1)
+        
+        # "\n" + indent + closing bracket
+        chars += 1 + 2 * level + 1
+        tokens += 1
+        after_ws = False
+    
+    walk(obj, 0)
+    return chars, tokens
+
+
+# Starter snippets for the Templates menu, keyed by template_type
+_ZW_TEMPLATES = {
+    'container': '''{container
+  {type object}
+  {id CHEST}
+  {description "a wooden chest"}
+  {flags [OPENBIT TRANSBIT]}
+  {contents [
+    {item {id EXAMPLE} {quantity 1}}
+  ]}
+}''',
+    'npc': '''{npc
+  {type character}
+  {id GUARD}
+  {description "a stern guard"}
+  {level 5}
+  {health 100}
+  {hostile false}
+  {dialogue [
+    {greeting "Halt! State your business."}
+  ]}
+}''',
+    'room': '''{room
+  {type scene}
+  {id CHAMBER}
+  {description "a dimly lit chamber"}
+  {exits [
+    {direction north} {leads_to CORRIDOR}
+    {direction south} {leads_to ENTRANCE}
+  ]}
+  {objects []}
+}''',
+    'item': '''{item
+  {type object}
+  {id SWORD}
+  {description "a sharp sword"}
+  {flags [WEAPONBIT TAKEBIT]}
+  {damage 15}
+  {weight 5}
+}''',
+    'rule': '''{rule
+  {type zon-memory}
+  {id example_rule}
+  {condition all_of}
+  {requires [
+    {flag "condition_met"}
+  ]}
+  {effect [
+    {action "trigger_event"}
+  ]}
+}'''
+}
 
 
 class ZWEditorCore:
@@ -35,83 +210,106 @@ class ZWEditorCore:
         self.parsed_data = None
         self.validation_result = None
         self.stats = {}
+        # LRU caches keyed by the buffer itself (str caches its own hash)
+        self._parse_cache = collections.OrderedDict()
+        self._vcache = collections.OrderedDict()
+        # The GUI packs on a worker thread while the UI thread may parse;
+        # reentrant because a validation miss parses inside its build
+        self._cache_lock = threading.RLock()
+    
+    def _lru(self, cache, key, build):
+        """Return cache[key], building and inserting it (evicting the oldest) on a miss"""
+        with self._cache_lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+            value = cache[key] = build()
+            if len(cache) > CORE_CACHE_SIZE:
+                cache.popitem(last=False)
+            return value
+    
+    def _parsed(self, content):
+        """parse_zw(content), run once per distinct buffer"""
+        return self._lru(self._parse_cache, content, lambda: parse_zw(content))
     
     def load_file(self, filepath):
         """Load ZW or ZONB file"""
-        with open(filepath, 'r') as f:
-            content = f.read()
+        content = Path(filepath).read_text(encoding='utf-8')
         
         self.current_file = filepath
         self.zw_content = content
+        # A new document - results for earlier buffers won't be asked for again
+        with self._cache_lock:
+            self._parse_cache.clear()
+            self._vcache.clear()
         return content
     
     def save_file(self, filepath, content):
         """Save ZW file"""
-        with open(filepath, 'w') as f:
-            f.write(content)
+        Path(filepath).write_text(content, encoding='utf-8')
         self.current_file = filepath
     
     def parse(self, content):
         """Parse ZW content"""
-        self.parsed_data = parse_zw(content)
+        self.parsed_data = self._parsed(content)
         return self.parsed_data
     
     def validate(self, content=None, zw_type=None):
         """Validate ZW content"""
         if content:
-            parsed = parse_zw(content)
+            self.validation_result = self._lru(
+                self._vcache, (content, zw_type),
+                lambda: self._run_validation(self._parsed(content), zw_type))
         else:
-            parsed = self.parsed_data
+            self.validation_result = self._run_validation(self.parsed_data, zw_type)
         
-        validator = ZWValidator(strict=False)
+        return self.validation_result
+    
+    def _run_validation(self, parsed, zw_type):
+        validator = get_validator(strict=False)
         is_valid = validator.validate(parsed, zw_type)
         
-        self.validation_result = {
+        # The validator is shared and reset by the next call - copy its lists
+        return {
             'valid': is_valid,
             'report': validator.get_report(),
-            'errors': validator.errors,
-            'warnings': validator.warnings
+            'errors': list(validator.errors),
+            'warnings': list(validator.warnings)
         }
-        
-        return self.validation_result
     
     def pack_to_zonb(self, zw_content, output_path):
         """Pack ZW to ZONB binary format"""
         # Parse ZW to dict
-        parsed = parse_zw(zw_content)
-        
-        # Convert to JSON bytes
-        json_bytes = json.dumps(parsed).encode('utf-8')
+        parsed = self._parsed(zw_content)
         
         # Pack to ZONB
         zonb_data = pack_to_zonb(parsed)
         
         # Write binary
-        with open(output_path, 'wb') as f:
-            f.write(zonb_data)
+        Path(output_path).write_bytes(zonb_data)
         
         return len(zonb_data)
     
     def unpack_zonb(self, zonb_path):
         """Unpack ZONB to viewable format"""
-        with open(zonb_path, 'rb') as f:
-            zonb_data = f.read()
+        return self.load_zonb(zonb_path)[0]
+    
+    def load_zonb(self, zonb_path):
+        """(unpacked, byte size) of a ZONB file - the size comes from the read, not a stat"""
+        zonb_data = Path(zonb_path).read_bytes()
         
         unpacked = unpack_from_zonb(zonb_data)
-        return unpacked
+        return unpacked, len(zonb_data)
     
     def calculate_compression_stats(self, zw_content):
         """Calculate compression statistics"""
         # ZW metrics
-        zw_tokens = len(zw_content.split())
+        zw_tokens = _count_tokens(zw_content)
         zw_chars = len(zw_content)
         
-        # Parse to get equivalent JSON
-        parsed = parse_zw(zw_content)
-        json_content = json.dumps(parsed, indent=2)
-        
-        json_tokens = len(json_content.split())
-        json_chars = len(json_content)
+        # Measure the equivalent indented JSON without building it
+        parsed = self._parsed(zw_content)
+        json_chars, json_tokens = _measure_json(parsed)
         
         # Calculate ratios
         token_ratio = json_tokens / zw_tokens if zw_tokens > 0 else 0
@@ -136,59 +334,7 @@ class ZWEditorCore:
     @staticmethod
     def get_template(template_type):
         """Get ZW templates for common structures"""
-        templates = {
-            'container': '''{container
-  {type object}
-  {id CHEST}
-  {description "a wooden chest"}
-  {flags [OPENBIT TRANSBIT]}
-  {contents [
-    {item {id EXAMPLE} {quantity 1}}
-  ]}
-}''',
-            'npc': '''{npc
-  {type character}
-  {id GUARD}
-  {description "a stern guard"}
-  {level 5}
-  {health 100}
-  {hostile false}
-  {dialogue [
-    {greeting "Halt! State your business."}
-  ]}
-}''',
-            'room': '''{room
-  {type scene}
-  {id CHAMBER}
-  {description "a dimly lit chamber"}
-  {exits [
-    {direction north} {leads_to CORRIDOR}
-    {direction south} {leads_to ENTRANCE}
-  ]}
-  {objects []}
-}''',
-            'item': '''{item
-  {type object}
-  {id SWORD}
-  {description "a sharp sword"}
-  {flags [WEAPONBIT TAKEBIT]}
-  {damage 15}
-  {weight 5}
-}''',
-            'rule': '''{rule
-  {type zon-memory}
-  {id example_rule}
-  {condition all_of}
-  {requires [
-    {flag "condition_met"}
-  ]}
-  {effect [
-    {action "trigger_event"}
-  ]}
-}'''
-        }
-        
-        return templates.get(template_type, "")
+        return _ZW_TEMPLATES.get(template_type, "")
 
 
 class ZWEditorGUI:
@@ -204,6 +350,14 @@ class ZWEditorGUI:
         # Core logic instance
         self.core = ZWEditorCore()
         
+        # Disk I/O runs here so big files don't freeze the editor. One
+        # worker keeps loads/saves/packs in submission order, so a later
+        # save can never land before an earlier one on the same path
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        
+        # Stripped editor text, re-read from Tk only after an edit (None = stale)
+        self._cached_content = None
+        
         self._create_menu()
         self._create_ui()
     
@@ -314,6 +468,7 @@ class ZWEditorGUI:
             selectbackground='#264f78'
         )
         self.zw_editor.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.zw_editor.bind('<<Modified>>', self._on_editor_modified)
         
         # Right panel - Output/Results
         right_frame = tk.Frame(paned)
@@ -380,6 +535,36 @@ class ZWEditorGUI:
                                    anchor=tk.W, font=('Arial', 9))
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
     
+    # ========== Editor Buffer ==========
+    
+    def _on_editor_modified(self, event=None):
+        """Drop the cached text; re-arm the one-shot <<Modified>> flag"""
+        self._cached_content = None
+        self.zw_editor.edit_modified(False)
+    
+    def _current_content(self):
+        """Editor text (stripped), copied out of Tk at most once per edit"""
+        if self._cached_content is None:
+            self._cached_content = self.zw_editor.get(1.0, tk.END).strip()
+        return self._cached_content
+    
+    # ========== Background I/O ==========
+    
+    def _run_io(self, busy_text, task, on_done):
+        """
+        Run task() on the I/O pool with a busy cursor, then call on_done(future)
+        back on the Tk thread. Widgets are only ever touched from on_done.
+        """
+        self.status_bar.config(text=busy_text)
+        self.root.config(cursor='watch')
+        future = self._io_pool.submit(task)
+        future.add_done_callback(
+            lambda f: self.root.after(0, self._io_done, f, on_done))
+    
+    def _io_done(self, future, on_done):
+        self.root.config(cursor='')
+        on_done(future)
+    
     # ========== File Operations ==========
     
     def open_zw_file(self):
@@ -390,17 +575,23 @@ class ZWEditorGUI:
         )
         
         if filepath:
-            try:
-                content = self.core.load_file(filepath)
-                
-                self.zw_editor.delete(1.0, tk.END)
-                self.zw_editor.insert(1.0, content)
-                
-                self.file_label.config(text=os.path.basename(filepath))
-                self.status_bar.config(text=f"Loaded: {filepath}")
-                
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to open file:\n{e}")
+            self._run_io(f"Loading {filepath}...",
+                         lambda: self.core.load_file(filepath),
+                         lambda f: self._on_zw_loaded(f, filepath))
+    
+    def _on_zw_loaded(self, future, filepath):
+        try:
+            content = future.result()
+            
+            self.zw_editor.delete(1.0, tk.END)
+            self.zw_editor.insert(1.0, content)
+            
+            self.file_label.config(text=os.path.basename(filepath))
+            self.status_bar.config(text=f"Loaded: {filepath}")
+            
+        except Exception as e:
+            self.status_bar.config(text="Open failed")
+            messagebox.showerror("Error", f"Failed to open file:\n{e}")
     
     def save_zw_file(self):
         """Save ZW file"""
@@ -415,14 +606,20 @@ class ZWEditorGUI:
         else:
             filepath = self.core.current_file
         
+        content = self._current_content()
+        self._run_io(f"Saving {filepath}...",
+                     lambda: self.core.save_file(filepath, content),
+                     lambda f: self._on_zw_saved(f, filepath))
+    
+    def _on_zw_saved(self, future, filepath):
         try:
-            content = self.zw_editor.get(1.0, tk.END).strip()
-            self.core.save_file(filepath, content)
+            future.result()
             
             self.file_label.config(text=os.path.basename(filepath))
             self.status_bar.config(text=f"Saved: {filepath}")
             
         except Exception as e:
+            self.status_bar.config(text="Save failed")
             messagebox.showerror("Error", f"Failed to save file:\n{e}")
     
     def open_zonb_file(self):
@@ -433,28 +630,34 @@ class ZWEditorGUI:
         )
         
         if filepath:
-            try:
-                unpacked = self.core.unpack_zonb(filepath)
-                formatted = json.dumps(unpacked, indent=2)
-                
-                self.zonb_output.delete(1.0, tk.END)
-                self.zonb_output.insert(1.0, f"📦 ZONB File: {os.path.basename(filepath)}\n\n")
-                self.zonb_output.insert(tk.END, formatted)
-                
-                # Get file size
-                file_size = os.path.getsize(filepath)
-                self.zonb_output.insert(tk.END, f"\n\n📏 File Size: {file_size} bytes")
-                
-                self.status_bar.config(text=f"Opened ZONB: {filepath}")
-                
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to open ZONB:\n{e}")
+            self._run_io(f"Opening {filepath}...",
+                         lambda: self._read_zonb(filepath),
+                         lambda f: self._on_zonb_loaded(f, filepath))
+    
+    def _read_zonb(self, filepath):
+        """Worker side of open_zonb_file - unpack, format and size the file"""
+        unpacked, file_size = self.core.load_zonb(filepath)
+        return _pretty_json(unpacked), file_size
+    
+    def _on_zonb_loaded(self, future, filepath):
+        try:
+            formatted, file_size = future.result()
+            
+            self._set_output(self.zonb_output,
+                f"📦 ZONB File: {os.path.basename(filepath)}\n\n"
+                f"{formatted}\n\n📏 File Size: {file_size} bytes")
+            
+            self.status_bar.config(text=f"Opened ZONB: {filepath}")
+            
+        except Exception as e:
+            self.status_bar.config(text="Open failed")
+            messagebox.showerror("Error", f"Failed to open ZONB:\n{e}")
     
     # ========== Core Operations ==========
     
     def parse_content(self):
         """Parse ZW content and display result"""
-        content = self.zw_editor.get(1.0, tk.END).strip()
+        content = self._current_content()
         
         if not content:
             self.parse_output.delete(1.0, tk.END)
@@ -463,11 +666,9 @@ class ZWEditorGUI:
         
         try:
             parsed = self.core.parse(content)
-            formatted = json.dumps(parsed, indent=2)
+            formatted = _pretty_json(parsed)
             
-            self.parse_output.delete(1.0, tk.END)
-            self.parse_output.insert(1.0, "✅ Parse successful!\n\n")
-            self.parse_output.insert(tk.END, formatted)
+            self._set_output(self.parse_output, "✅ Parse successful!\n\n" + formatted)
             
             self.status_bar.config(text="Parse successful")
             
@@ -478,7 +679,7 @@ class ZWEditorGUI:
     
     def validate_content(self):
         """Validate ZW content"""
-        content = self.zw_editor.get(1.0, tk.END).strip()
+        content = self._current_content()
         
         if not content:
             self.valid_output.delete(1.0, tk.END)
@@ -488,14 +689,12 @@ class ZWEditorGUI:
         try:
             result = self.core.validate(content)
             
-            self.valid_output.delete(1.0, tk.END)
-            
             if result['valid']:
-                self.valid_output.insert(1.0, "✅ VALIDATION PASSED\n\n")
+                header = "✅ VALIDATION PASSED\n\n"
             else:
-                self.valid_output.insert(1.0, "❌ VALIDATION FAILED\n\n")
+                header = "❌ VALIDATION FAILED\n\n"
             
-            self.valid_output.insert(tk.END, result['report'])
+            self._set_output(self.valid_output, header + result['report'])
             
             self.status_bar.config(text="Validation complete")
             
@@ -506,7 +705,7 @@ class ZWEditorGUI:
     
     def pack_to_zonb(self):
         """Pack current ZW to ZONB binary"""
-        content = self.zw_editor.get(1.0, tk.END).strip()
+        content = self._current_content()
         
         if not content:
             messagebox.showwarning("Warning", "No content to pack")
@@ -522,20 +721,26 @@ class ZWEditorGUI:
         if not filepath:
             return
         
+        self._run_io(f"Packing to {filepath}...",
+                     lambda: self.core.pack_to_zonb(content, filepath),
+                     lambda f: self._on_packed(f, filepath))
+    
+    def _on_packed(self, future, filepath):
         try:
-            byte_size = self.core.pack_to_zonb(content, filepath)
+            byte_size = future.result()
+            
+            self.status_bar.config(text=f"Packed to: {filepath} ({byte_size} bytes)")
             
             messagebox.showinfo("Success", 
                 f"Packed to ZONB successfully!\n\nFile: {os.path.basename(filepath)}\nSize: {byte_size} bytes")
             
-            self.status_bar.config(text=f"Packed to: {filepath} ({byte_size} bytes)")
-            
         except Exception as e:
+            self.status_bar.config(text="Pack failed")
             messagebox.showerror("Error", f"Failed to pack ZONB:\n{e}")
     
     def show_compression_stats(self):
         """Calculate and display compression statistics"""
-        content = self.zw_editor.get(1.0, tk.END).strip()
+        content = self._current_content()
         
         if not content:
             self.stats_output.delete(1.0, tk.END)
@@ -545,28 +750,30 @@ class ZWEditorGUI:
         try:
             stats = self.core.calculate_compression_stats(content)
             
-            self.stats_output.delete(1.0, tk.END)
-            self.stats_output.insert(1.0, "📊 COMPRESSION ANALYSIS\n")
-            self.stats_output.insert(tk.END, "="*60 + "\n\n")
-            
-            self.stats_output.insert(tk.END, "TOKEN COMPARISON:\n")
-            self.stats_output.insert(tk.END, f"  ZW tokens:     {stats['zw_tokens']:5d}\n")
-            self.stats_output.insert(tk.END, f"  JSON tokens:   {stats['json_tokens']:5d}\n")
-            self.stats_output.insert(tk.END, f"  Ratio:         {stats['token_ratio']:.2f}x\n")
-            self.stats_output.insert(tk.END, f"  Savings:       {stats['token_savings']:.1f}%\n\n")
-            
-            self.stats_output.insert(tk.END, "CHARACTER COMPARISON:\n")
-            self.stats_output.insert(tk.END, f"  ZW chars:      {stats['zw_chars']:5d}\n")
-            self.stats_output.insert(tk.END, f"  JSON chars:    {stats['json_chars']:5d}\n")
-            self.stats_output.insert(tk.END, f"  Ratio:         {stats['char_ratio']:.2f}x\n")
-            self.stats_output.insert(tk.END, f"  Savings:       {stats['char_savings']:.1f}%\n\n")
-            
-            self.stats_output.insert(tk.END, "="*60 + "\n")
-            self.stats_output.insert(tk.END, "💡 ZW achieves compression by eliminating:\n")
-            self.stats_output.insert(tk.END, "   • Colons after keys\n")
-            self.stats_output.insert(tk.END, "   • Quotes around keys\n")
-            self.stats_output.insert(tk.END, "   • Commas between elements\n")
-            self.stats_output.insert(tk.END, "   • Redundant punctuation\n")
+            parts = [
+                "📊 COMPRESSION ANALYSIS\n",
+                "="*60 + "\n\n",
+                
+                "TOKEN COMPARISON:\n",
+                f"  ZW tokens:     {stats['zw_tokens']:5d}\n",
+                f"  JSON tokens:   {stats['json_tokens']:5d}\n",
+                f"  Ratio:         {stats['token_ratio']:.2f}x\n",
+                f"  Savings:       {stats['token_savings']:.1f}%\n\n",
+                
+                "CHARACTER COMPARISON:\n",
+                f"  ZW chars:      {stats['zw_chars']:5d}\n",
+                f"  JSON chars:    {stats['json_chars']:5d}\n",
+                f"  Ratio:         {stats['char_ratio']:.2f}x\n",
+                f"  Savings:       {stats['char_savings']:.1f}%\n\n",
+                
+                "="*60 + "\n",
+                "💡 ZW achieves compression by eliminating:\n",
+                "   • Colons after keys\n",
+                "   • Quotes around keys\n",
+                "   • Commas between elements\n",
+                "   • Redundant punctuation\n",
+            ]
+            self._set_output(self.stats_output, "".join(parts))
             
             self.status_bar.config(text=f"Stats: {stats['char_savings']:.1f}% character savings")
             
@@ -574,6 +781,12 @@ class ZWEditorGUI:
             self.stats_output.delete(1.0, tk.END)
             self.stats_output.insert(1.0, f"❌ Stats calculation failed:\n\n{e}")
     
+    def _set_output(self, widget, text):
+        """Replace a pane's text in one insert (one Tk round-trip)"""
+        widget.delete(1.0, tk.END)
+        widget.insert(1.0, text)
+        widget.update_idletasks()
+    
     # ========== Template Operations ==========
     
     def insert_template(self, template_type):
@@ -1,25 +1,58 @@
 # zw.py
 import argparse
+import glob
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 from official_zw_validator import ZWValidator, ZWValidationError
+from official_zw_validator import validate_zw_file as _validate_path
+
+def _validate_one(job):
+    """Pool worker: (path, zw_type, strict) -> (path, ok, report); top-level so it pickles"""
+    path, zw_type, strict = job
+    try:
+        ok, validator = _validate_path(path, zw_type=zw_type, strict=strict)
+        return path, ok, validator.get_report()
+    except Exception as e:
+        return path, False, f"❌ {e}"
 
 def validate_zw_file(path, zw_type=None, strict=False):
-    validator = ZWValidator(strict=strict)
-    ok = validator.validate_zw_file(path, zw_type=zw_type)
-    report = validator.get_report()
-    for issue in report:
-        print(f"[{issue['level'].upper()}] {issue['message']}")
+    _, ok, report = _validate_one((path, zw_type, strict))
+    print(report)
     return ok
 
+def validate_files(paths, zw_type=None, strict=False, jobs=None):
+    """Validate many files, spread over `jobs` processes (default: one per CPU)"""
+    if len(paths) == 1:
+        return validate_zw_file(paths[0], zw_type=zw_type, strict=strict)
+    
+    work = [(path, zw_type, strict) for path in paths]
+    workers = jobs or os.cpu_count() or 1
+    if workers == 1:
+        results = map(_validate_one, work)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Batches keep per-file IPC small for corpora of tiny files
+            results = list(pool.map(_validate_one, work, chunksize=max(1, len(work) // (workers * 4))))
+    
+    all_ok = True
+    for path, ok, report in results:
+        print(f"--- {path} ---")
+        print(report)
+        all_ok = all_ok and ok
+    return all_ok
+
 def print_summary(path):
-    with open(path, 'r') as f:
-        data = json.load(f)
+    # Raw bytes: json.loads detects the encoding, and their length is the
+    # file size - no re-serializing the tree just to count it
+    with open(path, 'rb') as f:
+        raw = f.read()
+    data = json.loads(raw)
     print(f"--- {path} ---")
     print(f"Type: {data.get('type', 'unknown')}")
     print(f"ID: {data.get('id', 'unnamed')}")
     print(f"Keys: {list(data.keys())}")
-    print(f"Chars: {len(json.dumps(data))}")
+    print(f"Chars: {len(raw)}")
     print(f"Keys/Values: {len(data)}")
 
 def main():
@@ -27,8 +60,9 @@ def main():
     subparsers = parser.add_subparsers(dest='command', help="Available commands")
 
     # Validate
-    validate_parser = subparsers.add_parser("validate", help="Validate a .zw file")
-    validate_parser.add_argument("file", help="Path to the .zw file")
+    validate_parser = subparsers.add_parser("validate", help="Validate .zw files")
+    validate_parser.add_argument("file", nargs='+', help="Paths or glob patterns of .zw files")
+    validate_parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: one per CPU)")
     validate_parser.add_argument("--type", help="ZW block type (object, scene, etc.)")
     validate_parser.add_argument("--strict", action="store_true", help="Fail on any error")
 
@@ -39,7 +73,9 @@ def main():
     args = parser.parse_args()
 
     if args.command == "validate":
-        validate_zw_file(args.file, zw_type=args.type, strict=args.strict)
+        # Expand patterns here too, for shells that pass them through unexpanded
+        paths = [match for pattern in args.file for match in (sorted(glob.glob(pattern)) or [pattern])]
+        validate_files(paths, zw_type=args.type, strict=args.strict, jobs=args.jobs)
 
     elif args.command == "summary":
         print_summary(args.file)
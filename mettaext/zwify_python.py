@@ -8,14 +8,60 @@ import re
 import json
 import argparse
 import sys
+import functools
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
 
 
+# Per-name patterns, compiled once per field name instead of per call
+@functools.lru_cache(maxsize=256)
+def _field_re(field_name: str):
+    return re.compile(
+        rf'{field_name}\s*:\s*"?([^"\n]+)"?', 
+        re.IGNORECASE
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _list_field_re(field_name: str):
+    return re.compile(
+        rf'{field_name}\s*:\s*([\s\S]+?)(?:\n[A-Z][A-Z_]*\s*:|$)', 
+        re.IGNORECASE
+    )
+
+
+# Role substrings (matched in the lowercased role) that make a key
+# individual a ZW-LEADER / ZW-COMMAND rather than a plain profile
+_LEADER_TITLES = re.compile(r'queen|king|supreme|commander')
+_COMMAND_TITLES = re.compile(r'overseer|captain|chief|lead')
+
+# Runs of anything but [a-z0-9] collapse to one '-' in generated ids
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+
+@functools.lru_cache(maxsize=1024)
+def _slug(text: str) -> str:
+    """Id-safe form of a name; cached since names recur across ids and refs"""
+    if not text:
+        return ""
+    return _SLUG_RE.sub('-', text.lower()).strip('-')
+
+
 class ZWifyParser:
     """Parse mixed-format scenario descriptions into ZW format"""
     
+    # Bullet-list patterns shared by every section parser
+    _BULLET_SPLIT = re.compile(r'\n[-*•]\s+')
+    _BULLET_LINE = re.compile(r'^[-*•]\s+')
+    
+    # Text ending in a dialogue field name - "NAME:" there is a field, not a speaker
+    _DIALOGUE_FIELD_TAIL = re.compile(r'(?:SPEAKER|LINE|EMOTION|SCENE|STAGE)\s*$', re.IGNORECASE)
+    
+    # A line starting with 3+ letters ends the current section (the same
+    # boundary the OVERVIEW pattern uses); "NAME:" lines also open section NAME
+    _SECTION_BOUNDARY = re.compile(r'^([A-Z_]{3,}[A-Z0-9_]*)([ \t]*:)?', re.MULTILINE | re.IGNORECASE)
+    
     def __init__(self):
         self.patterns = {
             "chapter": re.compile(r'SCENARIO_CHAPTER\s*:\s*"?([^"\n]+)"?', re.IGNORECASE),
@@ -26,12 +72,48 @@ class ZWifyParser:
     
     def extract_section(self, content: str, section_name: str) -> str:
         """Extract a section using regex"""
-        pattern = re.compile(
-            rf'{section_name}\s*:\s*"?([\s\S]+?)(?:\n[A-Z_]{3,}|\Z)', 
-            re.IGNORECASE
-        )
-        match = pattern.search(content)
-        return match.group(1).strip() if match else ""
+        return self._split_sections(content).get(section_name.upper(), "")
+    
+    def _split_sections(self, content: str) -> Dict[str, str]:
+        """
+        Slice content into {SECTION_NAME: body} in one pass over its header
+        lines. A repeated header keeps its first body.
+        """
+        sections = {}
+        name = body_start = None
+        for boundary in self._SECTION_BOUNDARY.finditer(content):
+            if name is not None and name not in sections:
+                sections[name] = self._section_body(content[body_start:boundary.start()])
+            if boundary.group(2):
+                name, body_start = boundary.group(1).upper(), boundary.end()
+            else:
+                name = None
+        if name is not None and name not in sections:
+            sections[name] = self._section_body(content[body_start:])
+        return sections
+    
+    @staticmethod
+    def _section_body(text: str) -> str:
+        """Section text after its header, minus one opening quote"""
+        text = text.strip()
+        if text.startswith('"'):
+            text = text[1:].strip()
+        return text
+    
+    def _iter_bullets(self, section: str):
+        """Entries of a bullet-list section - re.split's pieces, sliced lazily"""
+        section = section.strip()
+        start = 0
+        for bullet in self._BULLET_SPLIT.finditer(section):
+            yield section[start:bullet.start()]
+            start = bullet.end()
+        yield section[start:]
+    
+    def _section(self, content: str, sections: Optional[Dict[str, str]], section_name: str) -> str:
+        """A section from a precomputed split, or from content when there is none"""
+        if sections is None:
+            sections = self._split_sections(content)
+        return sections.get(section_name, "")
     
     def extract_list_items(self, section_content: str) -> List[str]:
         """Extract bullet list items from a section"""
@@ -41,29 +123,37 @@ class ZWifyParser:
         for line in lines:
             line = line.strip()
             # Match bullet points starting with -, *, or •
-            if re.match(r'^[-*•]\s+', line):
+            bullet = self._BULLET_LINE.match(line)
+            if bullet:
                 # Remove bullet and clean
-                item = re.sub(r'^[-*•]\s+', '', line)
+                item = line[bullet.end():]
                 # Remove quotes if present
-                item = re.sub(r'^"|"$', '', item)
+                item = self._strip_edge_quotes(item)
                 if item:
                     items.append(item)
         
         return items
     
-    def parse_timeline(self, content: str) -> List[Dict]:
+    @staticmethod
+    def _strip_edge_quotes(text: str) -> str:
+        """Drop one leading and one trailing '"' (text is already stripped)"""
+        if text[:1] == '"':
+            text = text[1:]
+        if text[-1:] == '"':
+            text = text[:-1]
+        return text
+    
+    def parse_timeline(self, content: str, sections: Optional[Dict[str, str]] = None) -> List[Dict]:
         """Parse timeline events"""
         timeline = []
-        timeline_section = self.extract_section(content, "TIMELINE_OF_EVENTS")
+        timeline_section = self._section(content, sections, "TIMELINE_OF_EVENTS")
         
         if not timeline_section:
             return timeline
         
         # Split by bullet points
-        events_raw = re.split(r'\n[-*•]\s+', timeline_section.strip())
-        
-        for event_raw in events_raw:
-            if not event_raw.strip():
+        for event_raw in self._iter_bullets(timeline_section):
+            if not event_raw or event_raw.isspace():
                 continue
             
             event = {
@@ -79,26 +169,20 @@ class ZWifyParser:
     
     def _extract_field(self, text: str, field_name: str) -> str:
         """Extract field from text using pattern"""
-        pattern = re.compile(
-            rf'{field_name}\s*:\s*"?([^"\n]+)"?', 
-            re.IGNORECASE
-        )
-        match = pattern.search(text)
+        match = _field_re(field_name).search(text)
         return match.group(1).strip() if match else ""
     
-    def parse_factions(self, content: str) -> List[Dict]:
+    def parse_factions(self, content: str, sections: Optional[Dict[str, str]] = None) -> List[Dict]:
         """Parse factions section"""
         factions = []
-        factions_section = self.extract_section(content, "FACTIONS")
+        factions_section = self._section(content, sections, "FACTIONS")
         
         if not factions_section:
             return factions
         
         # Split factions by bullet points
-        factions_raw = re.split(r'\n[-*•]\s+', factions_section.strip())
-        
-        for faction_raw in factions_raw:
-            if not faction_raw.strip():
+        for faction_raw in self._iter_bullets(factions_section):
+            if not faction_raw or faction_raw.isspace():
                 continue
             
             faction = {
@@ -117,11 +201,7 @@ class ZWifyParser:
     def _extract_list_from_field(self, text: str, field_name: str) -> List[str]:
         """Extract list items from a specific field"""
         # Find the field content
-        field_pattern = re.compile(
-            rf'{field_name}\s*:\s*([\s\S]+?)(?:\n[A-Z][A-Z_]*\s*:|$)', 
-            re.IGNORECASE
-        )
-        match = field_pattern.search(text)
+        match = _list_field_re(field_name).search(text)
         
         if not match:
             return []
@@ -129,19 +209,17 @@ class ZWifyParser:
         field_content = match.group(1)
         return self.extract_list_items(field_content)
     
-    def parse_locations(self, content: str) -> List[Dict]:
+    def parse_locations(self, content: str, sections: Optional[Dict[str, str]] = None) -> List[Dict]:
         """Parse locations section"""
         locations = []
-        locations_section = self.extract_section(content, "LOCATIONS")
+        locations_section = self._section(content, sections, "LOCATIONS")
         
         if not locations_section:
             return locations
         
         # Split locations by bullet points
-        locations_raw = re.split(r'\n[-*•]\s+', locations_section.strip())
-        
-        for location_raw in locations_raw:
-            if not location_raw.strip():
+        for location_raw in self._iter_bullets(locations_section):
+            if not location_raw or location_raw.isspace():
                 continue
             
             location = {
@@ -155,19 +233,38 @@ class ZWifyParser:
         
         return locations
     
-    def parse_dialogue(self, content: str) -> List[Dict]:
+    def parse_dialogue(self, content: str, sections: Optional[Dict[str, str]] = None) -> List[Dict]:
         """Parse dialogue section"""
         dialogue = []
-        dialogue_section = self.extract_section(content, "DIALOGUE")
+        dialogue_section = self._section(content, sections, "DIALOGUE")
         
         if not dialogue_section:
             return dialogue
         
         # Split dialogue entries by bullet points
-        entries_raw = re.split(r'\n[-*•]\s+', dialogue_section.strip())
-        
-        for entry_raw in entries_raw:
-            if not entry_raw.strip():
+        for entry_raw in self._iter_bullets(dialogue_section):
+            if not entry_raw or entry_raw.isspace():
+                continue
+            
+            # Every field needs a colon - without one there is nothing to read
+            if ':' not in entry_raw:
+                continue
+            
+            # Compact "Speaker: text" on one line, with no field name before
+            # its only colon - none of the five field searches could match
+            if ('\n' not in entry_raw and entry_raw.count(':') == 1
+                    and not self._DIALOGUE_FIELD_TAIL.search(entry_raw[:entry_raw.index(':')])):
+                speaker, line = entry_raw.split(':', 1)
+                speaker = speaker.strip()
+                line = self._strip_edge_quotes(line.strip())
+                if speaker or line:
+                    dialogue.append({
+                        "speaker": speaker or "Unknown",
+                        "line": line,
+                        "emotion": "",
+                        "scene": "",
+                        "stage": ""
+                    })
                 continue
             
             # Try structured format first
@@ -180,7 +277,7 @@ class ZWifyParser:
                 speaker = parts[0].strip()
                 line = parts[1].strip()
                 # Remove quotes
-                line = re.sub(r'^"|"$', '', line)
+                line = self._strip_edge_quotes(line)
             
             if speaker or line:
                 dialogue.append({
@@ -195,6 +292,9 @@ class ZWifyParser:
     
     def parse(self, content: str) -> Dict:
         """Parse complete scenario"""
+        # One pass finds every section; the parsers below just index it
+        sections = self._split_sections(content)
+        
         # Extract basic info
         chapter_match = self.patterns["chapter"].search(content)
         phase_match = self.patterns["phase"].search(content)
@@ -203,42 +303,41 @@ class ZWifyParser:
         
         # Clean overview text
         overview_text = overview_match.group(1) if overview_match else ""
-        overview_text = re.sub(r'\n+', ' ', overview_text).strip()
+        # Each run of newlines becomes one space (dropping the empty pieces)
+        overview_text = ' '.join(filter(None, overview_text.split('\n'))).strip()
         
         return {
             "chapter": chapter_match.group(1) if chapter_match else "",
             "phase": phase_match.group(1) if phase_match else "",
             "overview": overview_text,
             "teaser": teaser_match.group(1) if teaser_match else "",
-            "themes": self.extract_list_items(self.extract_section(content, "KEY_THEMES_EMERGING")),
+            "themes": self.extract_list_items(sections.get("KEY_THEMES_EMERGING", "")),
             "objectives": self.extract_list_items(
-                self.extract_section(content, "ANUNNAKI_OBJECTIVES_FOR_PHASE_1") or 
-                self.extract_section(content, "OBJECTIVES")
+                sections.get("ANUNNAKI_OBJECTIVES_FOR_PHASE_1") or 
+                sections.get("OBJECTIVES", "")
             ),
-            "timeline": self.parse_timeline(content),
-            "locations": self.parse_locations(content),
-            "factions": self.parse_factions(content),
-            "relations": self._parse_relations(content),
-            "dialogue": self.parse_dialogue(content),
+            "timeline": self.parse_timeline(content, sections),
+            "locations": self.parse_locations(content, sections),
+            "factions": self.parse_factions(content, sections),
+            "relations": self._parse_relations(content, sections),
+            "dialogue": self.parse_dialogue(content, sections),
             "metadata": {
                 "parsed_at": datetime.now().isoformat(),
                 "source_length": len(content)
             }
         }
     
-    def _parse_relations(self, content: str) -> List[Dict]:
+    def _parse_relations(self, content: str, sections: Optional[Dict[str, str]] = None) -> List[Dict]:
         """Parse faction relations"""
         relations = []
-        relations_section = self.extract_section(content, "FACTION_RELATIONS")
+        relations_section = self._section(content, sections, "FACTION_RELATIONS")
         
         if not relations_section:
             return relations
         
         # Split relations by bullet points
-        relations_raw = re.split(r'\n[-*•]\s+', relations_section.strip())
-        
-        for rel_raw in relations_raw:
-            if not rel_raw.strip():
+        for rel_raw in self._iter_bullets(relations_section):
+            if not rel_raw or rel_raw.isspace():
                 continue
             
             relation = {
@@ -257,14 +356,8 @@ class ZWifyParser:
         """Generate ZW format from parsed data"""
         zw_lines = []
         
-        # Helper function for slug generation
-        def slug(text):
-            if not text:
-                return ""
-            return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
-        
         # ZW-CHAPTER header
-        chapter_id = f"ch-{slug(parsed_data['chapter'])}"
+        chapter_id = f"ch-{_slug(parsed_data['chapter'])}"
         zw_lines.append(
             f'ZW-CHAPTER id="{chapter_id}" '
             f'title="{parsed_data["chapter"]}" '
@@ -287,7 +380,7 @@ class ZWifyParser:
         # Locations
         loc_ids = {}
         for i, loc in enumerate(parsed_data["locations"]):
-            loc_id = f"loc-{slug(loc['name']) or f'loc{i}'}"
+            loc_id = f"loc-{_slug(loc['name']) or f'loc{i}'}"
             loc_ids[loc["name"]] = loc_id
             
             zw_lines.append(f'ZW-LOCATION id="{loc_id}" name="{loc["name"]}" type="{loc["type"]}"')
@@ -309,7 +402,7 @@ class ZWifyParser:
         # Factions and related entities
         fac_ids = {}
         for i, faction in enumerate(parsed_data["factions"]):
-            fac_id = f"fac-{slug(faction['name']) or f'fac{i}'}"
+            fac_id = f"fac-{_slug(faction['name']) or f'fac{i}'}"
             fac_ids[faction["name"]] = fac_id
             
             zw_lines.append(f'ZW-FACTION id="{fac_id}" name="{faction["name"]}" role="{faction["role"]}"')
@@ -330,27 +423,28 @@ class ZWifyParser:
                     name = name.strip()
                     role = role.strip()
                 
-                person_id = f"char-{slug(name)}"
+                person_id = f"char-{_slug(name)}"
                 
                 # Determine ZW type based on role
-                if any(title in role.lower() for title in ["queen", "king", "supreme", "commander"]):
+                role_lower = role.lower()
+                if _LEADER_TITLES.search(role_lower):
                     zw_lines.append(f'ZW-LEADER ref="{fac_id}" id="{person_id}" name="{name}" notes="{role}"')
-                elif any(title in role.lower() for title in ["overseer", "captain", "chief", "lead"]):
+                elif _COMMAND_TITLES.search(role_lower):
                     zw_lines.append(f'ZW-COMMAND ref="{fac_id}" id="{person_id}" name="{name}" notes="{role}"')
                 else:
                     zw_lines.append(f'ZW-PROFILE type="character" ref="{fac_id}" id="{person_id}" name="{name}" role="{role}"')
             
             # Technologies
             for tech in faction["technologies"]:
-                tech_id = f"tech-{slug(tech)}"
+                tech_id = f"tech-{_slug(tech)}"
                 zw_lines.append(f'ZW-TECH id="{tech_id}" owner="{fac_id}" name="{tech}"')
         
         zw_lines.append("")
         
         # Relations
         for i, rel in enumerate(parsed_data["relations"]):
-            a_id = fac_ids.get(rel["a"], f"fac-{slug(rel['a'])}")
-            b_id = fac_ids.get(rel["b"], f"fac-{slug(rel['b'])}")
+            a_id = fac_ids.get(rel["a"], f"fac-{_slug(rel['a'])}")
+            b_id = fac_ids.get(rel["b"], f"fac-{_slug(rel['b'])}")
             
             zw_lines.append(
                 f'ZW-FACTION-REL id="rel-{i}" '